@@ -17,6 +17,15 @@ from config import Config
 from .cli import register_cli
 from .extensions import db, jwt, migrate
 from .models.payment import Payment
+from .services.availability import availability_snapshot
+from .services.inventory import hold_sweeper
+from .utils.compression import compression
+from .utils.edge_cache import edge_cache
+from .utils.json_provider import init_json_provider
+from .utils.response_cache import response_cache
+from .utils.search import install_event_search
+from .utils.suggest import suggest_index
+from .utils.timeline import timeline_index
 
 # Import API after app to avoid circular imports
 from .api import init_app as init_api
@@ -24,6 +33,7 @@ from .api import init_app as init_api
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_json_provider(app)
 
     # Configure logging
     if not app.debug:
@@ -78,6 +88,13 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    response_cache.init_app(app)
+    compression.init_app(app)
+    edge_cache.init_app(app)
+    availability_snapshot.init_app(app)
+    timeline_index.init_app(app)
+    suggest_index.init_app(app)
+    hold_sweeper.init_app(app)
     
     # Initialize API with blueprints
     app = init_api(app)
@@ -189,6 +206,12 @@ def create_app():
             app.logger.error(f"Error initializing database: {str(e)}")
             # Don't raise here to allow the app to start in read-only mode
 
+        try:
+            app.extensions["event_search"] = install_event_search(db.engine)
+        except Exception as e:
+            app.extensions["event_search"] = None
+            app.logger.warning(f"Full-text search unavailable, using ilike: {str(e)}")
+
     @app.route("/health")
     def health_check():
         try:
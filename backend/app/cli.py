@@ -138,7 +138,11 @@ def register_cli(app):
 
     @app.cli.command("orders_force_complete_pending")
     def orders_force_complete_pending():
-        """Mark all pending orders as paid, generate QR codes, update quantity_sold."""
+        """Mark all pending orders as paid and generate QR codes.
+
+        quantity_sold is left alone: pending orders reserved their tickets
+        when they were created.
+        """
         from .models import Order, OrderItem, TicketType
         with app.app_context():
             updated = 0
@@ -158,14 +162,52 @@ def register_cli(app):
                             ticket_type_id=(tt.id if tt else None),
                             ticket_type_name=(tt.name if tt else None),
                         )
-                    # Update sold counts conservatively
-                    tt2 = TicketType.query.get(oi.ticket_type_id)
-                    if tt2:
-                        tt2.quantity_sold = (tt2.quantity_sold or 0) + (oi.quantity or 0)
                 updated += 1
             db.session.commit()
             click.echo(f"Force-completed {updated} pending orders.")
 
+    @app.cli.command("holds_sweep")
+    def holds_sweep():
+        """Release expired inventory holds now (the web workers also do this periodically)."""
+        from .services.inventory import release_expired_holds
+        with app.app_context():
+            released = release_expired_holds(batch_size=app.config.get("HOLD_SWEEP_BATCH", 500))
+            click.echo(f"Released {released} expired held tickets.")
+
+    @app.cli.command("idempotency_purge")
+    def idempotency_purge():
+        """Delete expired Idempotency-Key records (new requests also purge a batch now and then)."""
+        from .utils.idempotency import purge_expired_keys
+        with app.app_context():
+            purged = purge_expired_keys(batch_size=app.config.get("IDEMPOTENCY_PURGE_BATCH", 500))
+            click.echo(f"Purged {purged} expired idempotency keys.")
+
+    @app.cli.command("inventory_shard")
+    @click.argument("ticket_type_id")
+    @click.option("--shards", type=int, default=8, show_default=True, help="Counter rows to split the stock over; 0 to unshard")
+    def inventory_shard(ticket_type_id, shards):
+        """Spread a hot ticket type's stock over several counter rows."""
+        from .services.inventory import QuantityBelowClaimed, shard_ticket_type
+        from .utils.invalidation import notify_ticket_types_changed
+        with app.app_context():
+            try:
+                tid = UUID(str(ticket_type_id))
+            except Exception:
+                click.echo("Invalid ticket type id; aborting.")
+                return
+            if not db.session.get(TicketType, tid):
+                click.echo("Ticket type not found; aborting.")
+                return
+            try:
+                ticket_type = shard_ticket_type(tid, shards)
+            except QuantityBelowClaimed as e:
+                db.session.rollback()
+                click.echo(f"{str(e)}; aborting.")
+                return
+            db.session.commit()
+            notify_ticket_types_changed(ticket_type.event_id)
+            click.echo(f"{ticket_type.name}: {shards} shards, {ticket_type.quantity_available} available.")
+
     @app.cli.command("tickets_make_free")
     @click.option("--event", "event_id", default=None, help="Scope to a specific event UUID")
     def tickets_make_free(event_id):
@@ -8,6 +8,20 @@ from ..extensions import db
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        # Listing filters: published state / category, both ordered by date
+        db.Index("ix_events_published_start_date", "is_published", "start_date"),
+        db.Index("ix_events_category_start_date", "category", "start_date"),
+        # Upcoming/live timeline: only published rows are ever read
+        db.Index(
+            "ix_events_upcoming_start_date", "start_date",
+            postgresql_where=db.text("is_published"),
+        ),
+        db.Index(
+            "ix_events_upcoming_end_date", "end_date",
+            postgresql_where=db.text("is_published"),
+        ),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     organizer_id = db.Column(
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..extensions import db
+
+
+class IdempotencyKey(db.Model):
+    """Outcome of a request sent with an ``Idempotency-Key`` header.
+
+    The row is inserted before the request runs (``status_code`` NULL while
+    in progress, leased from ``locked_at``), so the primary key lets exactly one of several concurrent
+    duplicates through. Once finished, its response is replayed for retries
+    until ``expires_at``.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)  # sha256 of method, path and body
+    status_code = db.Column(db.SmallInteger, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Start of the current attempt; an unfinished row older than the lease
+    # (IDEMPOTENCY_LEASE_SECONDS) is taken over by the next retry
+    locked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
@@ -1,7 +1,9 @@
 import uuid
 from datetime import datetime
 
+from sqlalchemy import case, func, select
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from ..extensions import db
@@ -9,6 +11,13 @@ from ..extensions import db
 
 class TicketType(db.Model):
     __tablename__ = "ticket_types"
+    __table_args__ = (
+        # Covers the per-event "has availability" check without the heap
+        db.Index(
+            "ix_ticket_types_event_availability",
+            "event_id", "quantity_total", "quantity_sold", "quantity_held",
+        ),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = db.Column(
@@ -18,16 +27,77 @@ class TicketType(db.Model):
     price = db.Column(db.Integer, nullable=False)  # price in cents
     quantity_total = db.Column(db.Integer, nullable=False, default=0)
     quantity_sold = db.Column(db.Integer, nullable=False, default=0)
+    # Tickets set aside for unpaid orders (see InventoryHold)
+    quantity_held = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Number of TicketTypeShard counter rows sales are spread over; 0 sells
+    # straight off this row. When sharded, quantity_sold and quantity_held
+    # here are a roll-up of the shards refreshed by the hold sweeper.
+    inventory_shards = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
     event = db.relationship("Event", backref=db.backref("ticket_types", lazy=True))
+    shards = db.relationship(
+        "TicketTypeShard", lazy=True, cascade="all, delete-orphan", order_by="TicketTypeShard.shard"
+    )
 
-    @property
+    @hybrid_property
     def quantity_available(self):
-        return max(0, (self.quantity_total or 0) - (self.quantity_sold or 0))
+        if self.inventory_shards:
+            return sum(s.quantity_total - s.quantity_sold for s in self.shards)
+        return max(0, (self.quantity_total or 0) - (self.quantity_sold or 0) - (self.quantity_held or 0))
+
+    @quantity_available.expression
+    def quantity_available(cls):
+        remaining = cls.quantity_total - cls.quantity_sold - cls.quantity_held
+        sharded = (
+            select(func.coalesce(func.sum(TicketTypeShard.quantity_total - TicketTypeShard.quantity_sold), 0))
+            .where(TicketTypeShard.ticket_type_id == cls.id)
+            .scalar_subquery()
+        )
+        return case((cls.inventory_shards > 0, sharded), (remaining > 0, remaining), else_=0)
+
+
+class TicketTypeShard(db.Model):
+    """One slice of a sharded ticket type's stock.
+
+    Buyers claim from a random shard, so concurrent purchases of a hot
+    ticket type lock different rows instead of queueing on one.
+    ``quantity_sold`` counts held tickets too; which of them are only held
+    is recorded on their InventoryHold rows.
+    """
+    __tablename__ = "ticket_type_shards"
+
+    ticket_type_id = db.Column(
+        UUID(as_uuid=True), db.ForeignKey("ticket_types.id"), primary_key=True
+    )
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    quantity_total = db.Column(db.Integer, nullable=False, default=0)
+    quantity_sold = db.Column(db.Integer, nullable=False, default=0)
+
+
+class InventoryHold(db.Model):
+    """Tickets held for a pending order until it is paid or ``expires_at``.
+
+    The held quantity is also counted in ``TicketType.quantity_held``; the
+    sweeper releases expired holds in batches.
+    """
+    __tablename__ = "inventory_holds"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    order_id = db.Column(
+        UUID(as_uuid=True), db.ForeignKey("orders.id"), nullable=False, index=True
+    )
+    ticket_type_id = db.Column(
+        UUID(as_uuid=True), db.ForeignKey("ticket_types.id"), nullable=False
+    )
+    quantity = db.Column(db.Integer, nullable=False)
+    # Shard the tickets were claimed from, for sharded ticket types
+    shard = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
 class Ticket(db.Model):
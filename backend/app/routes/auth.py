@@ -6,13 +6,12 @@ from flask_jwt_extended import (
     create_access_token,
     get_jwt_identity,
     get_jwt,
-    jwt_required as jwt_required_original,
 )
 
 from ..extensions import db
 from ..models.user import User
 from ..schemas.user_schema import UserCreateSchema, UserLoginSchema, UserSchema
-from ..utils.auth import check_password, hash_password
+from ..utils.auth import check_password, hash_password, jwt_required as jwt_required_original
 from ..utils.email import send_welcome_email
 
 # Initialize schemas
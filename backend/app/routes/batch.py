@@ -0,0 +1,141 @@
+from urllib.parse import urlsplit
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from werkzeug.test import EnvironBuilder
+
+from ..extensions import db
+from ..utils.auth import VERIFIED_JWT_ENVIRON_KEY
+
+# Request headers a sub-request inherits from the batch request
+FORWARDED_HEADERS = ("Authorization", "Accept-Language", "X-Requested-With", "X-Free-Mode")
+# Request headers a sub-request may set for itself
+SUBREQUEST_HEADERS = ("If-None-Match", "If-Modified-Since", "Accept")
+# Response headers reported back for each sub-request
+RESPONSE_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "X-Total-Count")
+
+
+class InvalidBatch(ValueError):
+    pass
+
+
+def _parse_batch(payload, limit):
+    """Normalise the ``requests`` list of a batch body.
+
+    Each item is a path (``"/api/auth/me"``) or an object with ``path`` and
+    optional ``id`` and ``headers``. Only GET sub-requests against ``/api``
+    are run, and a batch cannot contain another batch.
+    """
+    items = (payload or {}).get("requests") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise InvalidBatch("requests must be a non-empty list")
+    if len(items) > limit:
+        raise InvalidBatch(f"At most {limit} requests can be batched")
+
+    parsed = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"path": item}
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise InvalidBatch(f"requests[{index}] must be a path or an object with a path")
+        method = (item.get("method") or "GET").upper()
+        if method != "GET":
+            raise InvalidBatch(f"requests[{index}]: only GET requests can be batched")
+        url = urlsplit(item["path"])
+        if url.scheme or url.netloc or not url.path.startswith("/api/"):
+            raise InvalidBatch(f"requests[{index}]: path must start with /api/")
+        if url.path.rstrip("/") == "/api/batch":
+            raise InvalidBatch(f"requests[{index}]: batches cannot be nested")
+        headers = item.get("headers") or {}
+        if not isinstance(headers, dict):
+            raise InvalidBatch(f"requests[{index}]: headers must be an object")
+        parsed.append({
+            "id": item.get("id", index),
+            "path": url.path,
+            "query_string": url.query,
+            "headers": {k: str(v) for k, v in headers.items() if k in SUBREQUEST_HEADERS},
+        })
+    return parsed
+
+
+def _dispatch(app, item, headers, environ_base):
+    """Run one GET sub-request through the full request pipeline.
+
+    The sub-request gets its own request context but shares the batch's
+    application context, so views use the same database session (and the
+    connection it already holds).
+    """
+    builder = EnvironBuilder(
+        path=item["path"],
+        query_string=item["query_string"],
+        method="GET",
+        headers={**headers, **item["headers"]},
+        environ_base=environ_base,
+    )
+    try:
+        with app.request_context(builder.get_environ()):
+            try:
+                response = app.full_dispatch_request()
+            except Exception as e:
+                current_app.logger.exception(f"Batched request {item['path']} failed: {str(e)}")
+                # Later sub-requests share this session
+                db.session.rollback()
+                response = app.make_response((jsonify({"message": "Internal server error"}), 500))
+            # Read the body while the sub-request context is still active
+            return response, response.get_data()
+    finally:
+        builder.close()
+
+
+def _encode_result(item, response, body):
+    dumps = current_app.json.dumps
+    meta = {
+        "id": item["id"],
+        "status": response.status_code,
+        "headers": {k: response.headers[k] for k in RESPONSE_HEADERS if k in response.headers},
+    }
+    if not body:
+        encoded_body = "null"
+    elif response.is_json:
+        # Splice the sub-response's JSON in as-is instead of re-encoding it
+        encoded_body = body.decode("utf-8")
+    else:
+        encoded_body = dumps(body.decode("utf-8", "replace"))
+    return dumps(meta, separators=(",", ":"))[:-1] + ',"body":' + encoded_body.strip() + "}"
+
+
+def init_app(app):
+    @app.route('/api/batch', methods=['POST'])
+    def run_batch():
+        """Run several GET requests in one round trip.
+
+        Body: ``{"requests": ["/api/auth/me", {"id": "mine", "path":
+        "/api/events?mine=true"}]}``. Responds with ``{"responses": [...]}``
+        in request order, each entry carrying the sub-request's ``id``,
+        ``status``, a few caching ``headers`` and its ``body``.
+        """
+        try:
+            items = _parse_batch(request.get_json(silent=True), current_app.config.get("BATCH_MAX_REQUESTS", 20))
+        except InvalidBatch as e:
+            return jsonify({"message": str(e)}), 400
+
+        # Verify the caller's token once up front: a bad token fails the
+        # whole batch instead of every authenticated sub-request
+        verify_jwt_in_request(optional=True)
+
+        headers = {k: request.headers[k] for k in FORWARDED_HEADERS if k in request.headers}
+        environ_base = {"REMOTE_ADDR": request.remote_addr}
+        if get_jwt():
+            # Sub-requests share this application context, so get_jwt()
+            # keeps returning the verified token there; the app's
+            # jwt_required skips verifying the forwarded header again
+            environ_base[VERIFIED_JWT_ENVIRON_KEY] = True
+        results = []
+        for item in items:
+            response, body = _dispatch(app, item, headers, environ_base)
+            results.append(_encode_result(item, response, body))
+
+        return current_app.response_class(
+            '{"responses":[' + ",".join(results) + "]}\n",
+            mimetype="application/json",
+        )
@@ -1,12 +1,13 @@
 from uuid import UUID as _UUID
 
 from flask import jsonify
-from flask_jwt_extended import get_jwt, jwt_required
+from flask_jwt_extended import get_jwt
 
 from ..extensions import db
 from ..models.event import Event
 from ..models.order import Order
 from ..models.user import User
+from ..utils.auth import jwt_required
 
 def init_app(app):
     @app.route('/api/dashboard/organizer', methods=['GET'])
@@ -1,4 +1,6 @@
 import sys
+from datetime import date, datetime, time, timedelta
+from math import ceil
 from uuid import UUID as _UUID
 
 # Prevent Flask-RESTful imports
@@ -6,24 +8,42 @@ if 'flask_restful' in sys.modules:
     raise ImportError('Flask-RESTful is not supported. Please remove all Flask-RESTful code.')
 
 from flask import current_app, request, jsonify
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required, verify_jwt_in_request
-from sqlalchemy import or_
-
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from ..extensions import db
 from ..models import Event
 from ..models.order import Order, OrderItem
 from ..models.ticket import TicketType
+from ..models.user import User
 from ..schemas.event_schema import (
     EventCreateSchema,
     EventSchema,
     EventUpdateSchema,
 )
-from ..utils.pagination import get_pagination_params
+from ..schemas.fast import compile_schema
+from ..schemas.ticket_schema import TicketTypeSchema
+from ..schemas.user_schema import UserSchema
+from ..services.event_series import InvalidSeries, clone_event, series_starts
+from ..utils.auth import jwt_required, verify_jwt_in_request
+from ..utils.batch import InvalidIds, fetch_by_ids, get_requested_ids
+from ..utils.compression import no_compress
+from ..utils.conditional import conditional, make_etag, respond_conditionally
+from ..utils.counting import count_query, get_count_strategy
+from ..utils.edge_cache import edge_cache
+from ..utils.fieldsets import InvalidFields, column_options, get_requested_fields, schema_variant
+from ..utils.invalidation import notify_events_changed
+from ..utils.pagination import InvalidCursor, encode_cursor, get_pagination_params, keyset_paginate
+from ..utils.response_cache import response_cache
+from ..utils.search import apply_event_search
+from ..utils.suggest import suggest_index
+from ..utils.timeline import timeline_index
 
-event_schema = EventSchema()
-events_schema = EventSchema(many=True)
+event_schema = compile_schema(EventSchema())
 event_create_schema = EventCreateSchema()
 event_update_schema = EventUpdateSchema()
+ticket_types_schema = compile_schema(TicketTypeSchema(many=True))
+organizer_schema = compile_schema(UserSchema(only=("id", "first_name", "last_name", "avatar_url")))
 
 def _parse_uuid(value):
     """Safely parse a UUID from a string.
@@ -65,73 +85,353 @@ def validate_event_ownership(event_id, user_id, role):
         
     return event, None
 
+class InvalidFilter(ValueError):
+    pass
+
+
+def _parse_bool_arg(name):
+    raw = (request.args.get(name) or "").strip().lower()
+    if not raw:
+        return None
+    if raw in ("1", "true", "yes"):
+        return True
+    if raw in ("0", "false", "no"):
+        return False
+    raise InvalidFilter(f"{name} must be true or false")
+
+
+def _parse_date_arg(name):
+    """Parse an ISO 8601 date or datetime argument.
+
+    Returns:
+        tuple: (value, is_date). is_date is True for a bare date such as
+        ``2026-11-02``, whose value is that day's midnight; value is None
+        when the argument is absent.
+    """
+    raw = (request.args.get(name) or "").strip()
+    if not raw:
+        return None, False
+    try:
+        return datetime.combine(date.fromisoformat(raw), time.min), True
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(raw), False
+    except ValueError:
+        raise InvalidFilter(f"{name} must be an ISO 8601 date")
+
+
+def _has_availability():
+    # quantity_available reads the shards of sharded types, whose
+    # ticket_types row only catches up at the next roll-up
+    return (
+        db.session.query(TicketType.id)
+        .filter(TicketType.event_id == Event.id, TicketType.quantity_available > 0)
+        .exists()
+    )
+
+
+def _filtered_events_query(apply_category=True):
+    """Build the filtered, unordered query behind ``GET /api/events``.
+
+    Applies the ``q`` full-text search, the ``category``, ``date_from``,
+    ``date_to``, ``published`` and ``available`` filters, and the ``mine``
+    ownership filter.
+
+    Args:
+        apply_category: Set to False to leave out the category filter, as
+            the category facet counts need.
+
+    Returns:
+        tuple: (query, relevance_order). query is None when ``mine=true``
+        leaves nothing visible to the caller.
+
+    Raises:
+        InvalidFilter: If a filter argument cannot be parsed.
+    """
+    q = (request.args.get("q") or "").strip()
+    mine = (request.args.get("mine") or "").lower() in ("1", "true", "yes")
+    categories = [
+        c.strip() for c in (request.args.get("category") or "").split(",") if c.strip()
+    ]
+    date_from, _ = _parse_date_arg("date_from")
+    date_to, date_to_is_date = _parse_date_arg("date_to")
+    published = _parse_bool_arg("published")
+    available = _parse_bool_arg("available")
+
+    # Initialize query
+    query = Event.query
+
+    # Apply full-text search filter if query parameter is provided
+    relevance = None
+    if q:
+        query, relevance = apply_event_search(query, q)
+
+    if categories and apply_category:
+        query = query.filter(Event.category.in_(categories))
+    if date_from is not None:
+        query = query.filter(Event.start_date >= date_from)
+    if date_to is not None:
+        if date_to_is_date:
+            # A bare date_to includes events starting at any time that day
+            query = query.filter(Event.start_date < date_to + timedelta(days=1))
+        else:
+            query = query.filter(Event.start_date <= date_to)
+    if published is not None:
+        query = query.filter(Event.is_published == published)
+    if available is not None:
+        query = query.filter(_has_availability() if available else ~_has_availability())
+
+    # Apply user-specific filters if mine=true
+    if mine:
+        try:
+            verify_jwt_in_request()
+            claims = get_jwt()
+            role = claims.get("role")
+            uid = _parse_uuid(get_jwt_identity())
+
+            if role == "admin":
+                # Admin can see all events when mine=true
+                pass
+            elif role == "organizer" and uid:
+                # Organizer can only see their own events
+                query = query.filter(Event.organizer_id == uid)
+            else:
+                # Regular users see nothing when mine=true
+                return None, None
+        except Exception as e:
+            current_app.logger.warning("Failed to verify JWT for mine filter: %s", str(e))
+            return None, None
+
+    return query, relevance
+
+
+def _category_facets():
+    """Per-category event counts for the current filters, in one grouped query.
+
+    The category filter itself is left out so the sidebar keeps showing
+    the other categories' counts while one is selected.
+    """
+    query, _ = _filtered_events_query(apply_category=False)
+    if query is None:
+        return []
+    rows = (
+        query.order_by(None)
+        .with_entities(Event.category, func.count(Event.id))
+        .group_by(Event.category)
+        .all()
+    )
+    facets = [{"value": category, "count": count} for category, count in rows]
+    facets.sort(key=lambda f: (-f["count"], f["value"] or ""))
+    return facets
+
+
+def _page_validators(items, *parts):
+    """ETag and Last-Modified for a listing, from the page's own rows.
+
+    The rows (with their ``updated_at``) and the total are fetched for the
+    response anyway, so validating costs no extra query.
+    """
+    stamps = [e.updated_at for e in items if e.updated_at is not None]
+    last_modified = max(stamps) if stamps else None
+    # mine=true listings differ per caller even with equal pages
+    owner = get_jwt_identity() if (request.args.get("mine") or "").lower() in ("1", "true", "yes") else None
+    rows = [(e.id, e.updated_at) for e in items]
+    return make_etag("events", owner, rows, *parts), last_modified
+
+
+def _timeline_page(lookup):
+    """One page of a timeline view (upcoming/live) from the in-memory index.
+
+    The index supplies the ordered ids; the rows themselves come from a
+    single primary-key ``IN`` query.
+    """
+    try:
+        _, per_page, cursor = get_pagination_params(allow_cursor=True)
+        only = get_requested_fields(EventSchema)
+    except (InvalidCursor, InvalidFields) as e:
+        return {"message": str(e)}, 400
+    if cursor and cursor[2] != "next":
+        return {"message": "Timeline cursors only page forward"}, 400
+
+    found = lookup(per_page, after=cursor[:2] if cursor else None)
+    has_more = len(found) > per_page
+    found = found[:per_page]
+    items, _ = fetch_by_ids(
+        Event.query.filter(Event.is_published.is_(True)).options(*column_options(Event, only)),
+        Event.id,
+        [event_id for _, event_id in found],
+    )
+    return {
+        "items": schema_variant(EventSchema, only, many=True).dump(items),
+        "meta": {
+            "per_page": per_page,
+            "next_cursor": encode_cursor(*found[-1], "next") if has_more else None,
+        },
+    }, 200
+
+
+EVENT_INCLUDES = ("ticket_types", "organizer")
+
+
+def _event_includes():
+    """Parse ``?include=`` into the set of supported expansions."""
+    raw = request.args.get("include") or ""
+    return {part.strip() for part in raw.split(",")} & set(EVENT_INCLUDES)
+
+
+def _event_validators(event_id):
+    eid = _parse_uuid(event_id)
+    if not eid:
+        return None
+    include = _event_includes()
+    query = db.session.query(Event.updated_at).filter(Event.id == eid)
+    group_by = [Event.id, Event.updated_at]
+    if "organizer" in include:
+        query = query.outerjoin(User, User.id == Event.organizer_id).add_columns(User.updated_at)
+        group_by.append(User.updated_at)
+    if "ticket_types" in include:
+        query = (
+            query.outerjoin(TicketType, TicketType.event_id == Event.id)
+            .add_columns(func.max(TicketType.updated_at), func.count(TicketType.id))
+            .group_by(*group_by)
+        )
+    row = query.first()
+    if row is None:
+        return None
+    stamps = [v for v in row if isinstance(v, datetime)]
+    return make_etag("event", eid, *row), max(stamps) if stamps else None
+
+
+def _event_ticket_types(event_id):
+    """Ticket types for embedding, with availability computed in SQL."""
+    rows = (
+        db.session.query(
+            TicketType.id,
+            TicketType.event_id,
+            TicketType.name,
+            TicketType.price,
+            TicketType.quantity_total,
+            TicketType.quantity_sold,
+            TicketType.quantity_available.label("quantity_available"),
+            TicketType.created_at,
+            TicketType.updated_at,
+        )
+        .filter(TicketType.event_id == event_id)
+        .order_by(TicketType.created_at)
+        .all()
+    )
+    return ticket_types_schema.dump(rows)
+
+
 def init_app(app):
+    def _list_cache_tags():
+        # Only the public listing is shared; mine=true is per-user
+        if (request.args.get("mine") or "").lower() in ("1", "true", "yes"):
+            return None
+        return ["events:list"]
+
+    def _detail_cache_tags(event_id):
+        eid = _parse_uuid(event_id)
+        # Remaining ticket counts change on every sale without a purge, so
+        # ?include=ticket_types is not cached (conditional GETs still work)
+        if not eid or "ticket_types" in _event_includes():
+            return None
+        return [f"event:{eid}"]
+
+    def _suggest_cache_tags():
+        return ["events:list"]
+
+    def _timeline_cache_tags():
+        # Also changes as time passes, hence the short s-maxage
+        return ["events:list"]
+
     @app.route('/api/events', methods=['GET'])
+    @edge_cache.public(_list_cache_tags)
+    @response_cache.cached("events:list", _list_cache_tags)
     def get_events():
         try:
-            # Get pagination parameters
-            page, per_page = get_pagination_params()
+            # Get pagination parameters (offset or cursor mode)
+            try:
+                page, per_page, cursor = get_pagination_params(allow_cursor=True)
+            except InvalidCursor:
+                return {"message": "Invalid cursor"}, 400
             q = (request.args.get("q") or "").strip()
+            sort = (request.args.get("sort") or "").strip().lower()
             mine = (request.args.get("mine") or "").lower() in ("1", "true", "yes")
+            facets = {
+                f.strip() for f in (request.args.get("facets") or "").split(",") if f.strip()
+            }
             
-            # Initialize query
-            query = Event.query
+            try:
+                only = get_requested_fields(EventSchema)
+                ids = get_requested_ids()
+                if ids is None:
+                    query, relevance = _filtered_events_query()
+            except (InvalidFilter, InvalidFields, InvalidIds) as e:
+                return {"message": str(e)}, 400
             
-            # Apply search filter if query parameter is provided
-            if q:
-                like = f"%{q}%"
-                query = query.filter(
-                    or_(
-                        Event.title.ilike(like),
-                        Event.description.ilike(like),  # Add description to search
-                        Event.category.ilike(like),
-                        Event.venue_name.ilike(like),
-                        Event.address.ilike(like),
-                    )
+            if ids is not None:
+                # Batch lookup: one IN query, results in request order
+                items, missing = fetch_by_ids(
+                    Event.query.options(*column_options(Event, only, always=("id", "updated_at"))),
+                    Event.id,
+                    ids,
                 )
+                return respond_conditionally(*_page_validators(items, missing), lambda: ({
+                    "items": schema_variant(EventSchema, only, many=True).dump(items),
+                    "missing": missing,
+                }, 200))
+            if query is None:
+                # mine=true with no events visible to the caller
+                return {
+                    "items": [],
+                    "meta": {
+                        "page": 1,
+                        "per_page": per_page,
+                        "total": 0,
+                        "pages": 0,
+                    }
+                }, 200
+            # Sparse fieldsets: skip unrequested columns (notably the
+            # description Text) in the SELECT itself
+            query = query.options(*column_options(Event, only, always=("id", "start_date", "updated_at")))
             
-            # Apply user-specific filters if mine=true
-            if mine:
-                try:
-                    verify_jwt_in_request()
-                    claims = get_jwt()
-                    role = claims.get("role")
-                    uid = _parse_uuid(get_jwt_identity())
-                    
-                    if role == "admin":
-                        # Admin can see all events when mine=true
-                        pass
-                    elif role == "organizer" and uid:
-                        # Organizer can only see their own events
-                        query = query.filter(Event.organizer_id == uid)
-                    else:
-                        # Regular users see nothing when mine=true
-                        return {
-                            "items": [],
-                            "meta": {
-                                "page": 1,
-                                "per_page": per_page,
-                                "total": 0,
-                                "pages": 0,
-                            }
-                        }, 200
-                except Exception as e:
-                    current_app.logger.warning("Failed to verify JWT for mine filter: %s", str(e))
-                    return {
-                        "items": [],
-                        "meta": {
-                            "page": 1,
-                            "per_page": per_page,
-                            "total": 0,
-                            "pages": 0,
-                        }
-                    }, 200
-            
-            # Order by start date (newest first)
-            query = query.order_by(Event.start_date.desc())
-            
-            # Execute paginated query
-            paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+            if cursor is not None:
+                # Keyset mode on (start_date, id): no OFFSET scan, no COUNT(*)
+                if sort == "relevance":
+                    return {"message": "sort=relevance cannot be combined with cursor pagination"}, 400
+                items, meta = keyset_paginate(
+                    query, Event.start_date, Event.id, cursor, per_page
+                )
+                total = None
+            else:
+                # Order by relevance when asked for (and searching), otherwise
+                # by start date (newest first)
+                if sort == "relevance" and relevance is not None:
+                    query = query.order_by(relevance, Event.start_date.desc())
+                else:
+                    query = query.order_by(Event.start_date.desc())
+
+                # Execute paginated query; the total comes from the selected
+                # count strategy rather than paginate()'s own COUNT(*)
+                paginated = query.paginate(
+                    page=page, per_page=per_page, error_out=False, count=False
+                )
+                items = paginated.items
+                total, count_used = count_query(
+                    query,
+                    "events",
+                    strategy=get_count_strategy("EVENTS_COUNT_STRATEGY"),
+                    filtered=query.whereclause is not None,
+                )
+                meta = {
+                    "page": paginated.page,
+                    "per_page": paginated.per_page,
+                    "total": total,
+                    "pages": int(ceil(total / per_page)) if total else 0,
+                    "count": count_used,
+                }
             
             # Get JWT claims for logging (if available)
             try:
@@ -145,26 +445,25 @@ def init_app(app):
             
             # Log the request
             current_app.logger.info(
-                "events.list q='%s' mine=%s page=%s per_page=%s total=%s user=%s role=%s",
+                "events.list q='%s' sort=%s mine=%s page=%s per_page=%s total=%s user=%s role=%s",
                 q,
+                sort,
                 mine,
                 page,
                 per_page,
-                paginated.total,
+                total,
                 user_id,
                 role,
             )
             
-            # Return paginated response
-            return {
-                "items": events_schema.dump(paginated.items),
-                "meta": {
-                    "page": paginated.page,
-                    "per_page": paginated.per_page,
-                    "total": paginated.total,
-                    "pages": paginated.pages,
-                }
-            }, 200
+            if "category" in facets:
+                meta["facets"] = {"category": _category_facets()}
+            
+            # Return paginated response (or a 304 if the client has this page)
+            return respond_conditionally(*_page_validators(items, meta), lambda: ({
+                "items": schema_variant(EventSchema, only, many=True).dump(items),
+                "meta": meta,
+            }, 200))
             
         except Exception as e:
             current_app.logger.exception("Failed to fetch events: %s", str(e))
@@ -199,20 +498,157 @@ def init_app(app):
         )
         db.session.add(ev)
         db.session.commit()
+        notify_events_changed(ev.id)
         current_app.logger.info(
             "events.create id=%s by user=%s role=%s", ev.id, get_jwt_identity(), role
         )
         return {"event": event_schema.dump(ev)}, 201
 
+    def _clone_options(json_data):
+        is_published = json_data.get("is_published", False)
+        if not isinstance(is_published, bool):
+            raise InvalidSeries("is_published must be a boolean")
+        title = json_data.get("title")
+        if title is not None and (not isinstance(title, str) or not title.strip() or len(title) > 255):
+            raise InvalidSeries("title must be a non-empty string of at most 255 characters")
+        return {
+            "is_published": is_published,
+            "title": title.strip() if title else None,
+            "copy_ticket_types": bool(json_data.get("copy_ticket_types", True)),
+        }
+
+    def _load_source_event(event_id):
+        claims = get_jwt()
+        role = claims.get("role")
+        if role not in ("organizer", "admin"):
+            return None, ({"message": "Forbidden"}, 403)
+        eid = _parse_uuid(event_id)
+        if not eid:
+            return None, ({"message": "Invalid event ID"}, 400)
+        return validate_event_ownership(eid, _parse_uuid(get_jwt_identity()), role)
+
+    @app.route('/api/events/<event_id>/clone', methods=['POST'])
+    @jwt_required()
+    def clone_single_event(event_id):
+        """Copy an event and its ticket types, optionally to a new start date.
+
+        Body (all optional): ``start_date`` (ISO 8601, defaults to the
+        source's), ``title``, ``is_published`` (default false) and
+        ``copy_ticket_types`` (default true).
+        """
+        source, error = _load_source_event(event_id)
+        if error:
+            return error
+        json_data = request.get_json(silent=True) or {}
+        try:
+            options = _clone_options(json_data)
+            start = json_data.get("start_date")
+            try:
+                start = datetime.fromisoformat(start) if start else source.start_date
+            except (TypeError, ValueError):
+                raise InvalidSeries("start_date must be an ISO 8601 date")
+        except InvalidSeries as e:
+            return {"message": str(e)}, 400
+
+        events = clone_event(source, [start], **options)
+        notify_events_changed(events[0].id)
+        current_app.logger.info(
+            "events.clone id=%s from=%s by user=%s", events[0].id, source.id, get_jwt_identity()
+        )
+        return {"event": event_schema.dump(events[0])}, 201
+
+    @app.route('/api/events/<event_id>/series', methods=['POST'])
+    @jwt_required()
+    def create_event_series(event_id):
+        """Create a recurring series from an event in one transaction.
+
+        Body: ``rrule`` (RFC 5545 recurrence rule anchored on the event's
+        start, e.g. ``FREQ=WEEKLY;COUNT=52``) plus the options of the clone
+        endpoint. The source occurrence itself is not duplicated.
+        """
+        source, error = _load_source_event(event_id)
+        if error:
+            return error
+        json_data = request.get_json(silent=True) or {}
+        try:
+            options = _clone_options(json_data)
+            starts = series_starts(
+                source, json_data.get("rrule"), current_app.config.get("EVENT_SERIES_MAX", 104)
+            )
+        except InvalidSeries as e:
+            return {"message": str(e)}, 400
+
+        events = clone_event(source, starts, **options)
+        # One signal for the whole batch: caches and indexes reload once
+        # instead of once per occurrence
+        notify_events_changed()
+        current_app.logger.info(
+            "events.series from=%s count=%s by user=%s", source.id, len(events), get_jwt_identity()
+        )
+        return {"events": schema_variant(EventSchema, None, many=True).dump(events), "count": len(events)}, 201
+
+    @app.route('/api/events/suggest', methods=['GET'])
+    @edge_cache.public(_suggest_cache_tags)
+    @no_compress
+    def suggest_events():
+        """Typeahead suggestions for the search box.
+
+        Served from the in-process prefix index, so no event query runs per
+        keystroke once the index is warm.
+        """
+        prefix = request.args.get("prefix") or ""
+        try:
+            limit = int(request.args.get("limit", 8))
+        except ValueError:
+            limit = 8
+        limit = max(1, min(limit, 20))
+        try:
+            return {"suggestions": suggest_index.lookup(prefix[:100], limit)}, 200
+        except Exception as e:
+            current_app.logger.error(f"Error building suggestions: {str(e)}")
+            return {"message": "Failed to load suggestions"}, 500
+
+    @app.route('/api/events/upcoming', methods=['GET'])
+    @edge_cache.public(_timeline_cache_tags, s_maxage=60)
+    def get_upcoming_events():
+        """Published events that have not started yet, soonest first."""
+        try:
+            return _timeline_page(timeline_index.upcoming)
+        except Exception as e:
+            current_app.logger.exception("Failed to fetch upcoming events: %s", str(e))
+            return {"message": "Failed to fetch events"}, 500
+
+    @app.route('/api/events/live', methods=['GET'])
+    @edge_cache.public(_timeline_cache_tags, s_maxage=60)
+    def get_live_events():
+        """Published events in progress right now, by start date."""
+        try:
+            return _timeline_page(timeline_index.live)
+        except Exception as e:
+            current_app.logger.exception("Failed to fetch live events: %s", str(e))
+            return {"message": "Failed to fetch events"}, 500
+
     @app.route('/api/events/<event_id>', methods=['GET'])
+    @edge_cache.public(_detail_cache_tags)
+    @response_cache.cached("events:detail", _detail_cache_tags)
+    @conditional(_event_validators)
     def get_event(event_id):
         eid = _parse_uuid(event_id)
         if not eid:
             return {"message": "Invalid id"}, 400
-        ev = Event.query.get(eid)
+        include = _event_includes()
+        query = Event.query.filter(Event.id == eid)
+        if "organizer" in include:
+            query = query.options(joinedload(Event.organizer))
+        ev = query.first()
         if not ev:
             return {"message": "Not found"}, 404
-        return {"event": event_schema.dump(ev)}, 200
+        data = event_schema.dump(ev)
+        if "organizer" in include:
+            data["organizer"] = organizer_schema.dump(ev.organizer) if ev.organizer else None
+        if "ticket_types" in include:
+            data["ticket_types"] = _event_ticket_types(eid)
+        return {"event": data}, 200
 
     @app.route('/api/events/<event_id>', methods=['PUT'])
     @jwt_required()
@@ -251,6 +687,7 @@ def init_app(app):
                         setattr(event, field, json_data[field])
                 
                 db.session.commit()
+                notify_events_changed(event.id)
                 current_app.logger.info(
                     "Event updated - Event ID: %s, User: %s, Role: %s, Updated Fields: %s",
                     event.id, user_id, role, list(json_data.keys())
@@ -310,6 +747,7 @@ def init_app(app):
             # Now delete the event
             db.session.delete(ev)
             db.session.commit()
+            notify_events_changed(eid)
             
             current_app.logger.info(
                 "events.delete id=%s by user=%s role=%s", 
@@ -0,0 +1,200 @@
+import hashlib
+from uuid import UUID as _UUID
+from xml.sax.saxutils import escape as xml_escape
+
+from flask import current_app, jsonify, request, stream_with_context
+from sqlalchemy import select
+
+from ..extensions import db
+from ..models.event import Event
+from ..models.user import User
+from ..utils.edge_cache import edge_cache
+from ..utils.response_cache import CachedResponse, CachedVariants, response_cache
+from ..utils.streaming import STREAM_BATCH_SIZE
+
+# Feeds depend on every published event, so any event write invalidates them
+FEED_TAGS = ("events:list",)
+
+ICS_MIMETYPE = "text/calendar"
+SITEMAP_MIMETYPE = "application/xml"
+
+
+def _published_rows(organizer_id=None):
+    """Yield batches of the few event columns the feeds render."""
+    stmt = (
+        select(Event.id, Event.title, Event.start_date, Event.end_date, Event.venue_name, Event.updated_at)
+        .where(Event.is_published.is_(True))
+        .order_by(Event.start_date, Event.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    if organizer_id is not None:
+        stmt = stmt.where(Event.organizer_id == organizer_id)
+    yield from db.session.execute(stmt).partitions()
+
+
+def _event_url(event_id):
+    return f"{current_app.config['FRONTEND_URL'].rstrip('/')}/events/{event_id}"
+
+
+def _ics_text(value):
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_time(value):
+    # Event dates are stored as naive UTC
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_line(line):
+    """Fold a content line at 75 octets (RFC 5545 section 3.1)."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start = [], 0
+    while start < len(data):
+        end = min(start + (75 if not parts else 74), len(data))
+        # Never split a multi-byte character
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start = end
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def render_ics(batches, name):
+    yield (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//EventGrid//Events//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        + _ics_line(f"X-WR-CALNAME:{_ics_text(name)}")
+    )
+    for rows in batches:
+        yield "".join(
+            "BEGIN:VEVENT\r\n"
+            + _ics_line(f"UID:{row.id}@eventgrid")
+            + f"DTSTAMP:{_ics_time(row.updated_at or row.start_date)}\r\n"
+            + f"DTSTART:{_ics_time(row.start_date)}\r\n"
+            + f"DTEND:{_ics_time(row.end_date)}\r\n"
+            + _ics_line(f"SUMMARY:{_ics_text(row.title)}")
+            + (_ics_line(f"LOCATION:{_ics_text(row.venue_name)}") if row.venue_name else "")
+            + _ics_line(f"URL:{_event_url(row.id)}")
+            + "END:VEVENT\r\n"
+            for row in rows
+        )
+    yield "END:VCALENDAR\r\n"
+
+
+def render_sitemap(batches):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    )
+    for rows in batches:
+        yield "".join(
+            f"<url><loc>{xml_escape(_event_url(row.id))}</loc>"
+            + (f"<lastmod>{row.updated_at.strftime('%Y-%m-%d')}</lastmod>" if row.updated_at else "")
+            + "</url>\n"
+            for row in rows
+        )
+    yield "</urlset>\n"
+
+
+def _store_as_it_streams(key, chunks):
+    """Pass ``chunks`` through as bytes and cache the body once complete.
+
+    The cached copy gets a content-hash ETag. An interrupted stream (client
+    gone, query error) stores nothing.
+    """
+    parts, digest = [], hashlib.sha1()
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        parts.append(data)
+        digest.update(data)
+        yield data
+    entry = CachedResponse(b"".join(parts), {"ETag": f'"{digest.hexdigest()}"'})
+    try:
+        response_cache.backend.set(key, entry, response_cache.ttl)
+    except Exception as e:
+        current_app.logger.error(f"Feed cache write failed: {str(e)}")
+
+
+def serve_feed(name, mimetype, render):
+    """Serve a feed from the response cache, or stream it from the database.
+
+    Cache keys embed the ``events:list`` tag version, so an event write makes
+    the next request regenerate the feed. Hits (and their 304s) never touch
+    the database. The generating request is streamed without an ETag; later
+    hits carry the cached body's ETag.
+
+    Args:
+        name: Cache key suffix identifying the feed.
+        mimetype: Response mimetype.
+        render: Callable returning an iterator of ``str`` chunks.
+    """
+    if not response_cache.enabled:
+        return current_app.response_class(stream_with_context(render()), mimetype=mimetype)
+
+    try:
+        key = response_cache.make_key(f"feeds:{name}", FEED_TAGS)
+        entry = response_cache.backend.get(key)
+    except Exception as e:
+        current_app.logger.error(f"Feed cache read failed: {str(e)}")
+        return current_app.response_class(stream_with_context(render()), mimetype=mimetype)
+
+    if entry is not None:
+        response = current_app.response_class(entry.body, mimetype=mimetype)
+        response.headers.update(entry.headers)
+        response.headers["X-Cache"] = "HIT"
+        response.cached_variants = CachedVariants(response_cache.backend, key, entry)
+        return response.make_conditional(request)
+
+    response = current_app.response_class(
+        stream_with_context(_store_as_it_streams(key, render())), mimetype=mimetype
+    )
+    response.headers["X-Cache"] = "MISS"
+    return response
+
+
+def _feed_cache_tags(**kwargs):
+    return list(FEED_TAGS)
+
+
+def init_app(app):
+    @app.route('/api/events/feed.ics', methods=['GET'])
+    @edge_cache.public(_feed_cache_tags)
+    def get_events_feed():
+        """iCalendar feed of all published events."""
+        return serve_feed(
+            "events.ics", ICS_MIMETYPE,
+            lambda: render_ics(_published_rows(), "EventGrid events"),
+        )
+
+    @app.route('/api/organizers/<organizer_id>/feed.ics', methods=['GET'])
+    @edge_cache.public(_feed_cache_tags)
+    def get_organizer_feed(organizer_id):
+        """iCalendar feed of one organizer's published events."""
+        try:
+            uid = _UUID(str(organizer_id))
+        except Exception:
+            return jsonify({"message": "Invalid organizer ID"}), 400
+
+        def render():
+            organizer = db.session.get(User, uid)
+            name = " ".join(filter(None, (organizer.first_name, organizer.last_name))) if organizer else ""
+            return render_ics(_published_rows(uid), f"{name or 'Organizer'} on EventGrid")
+
+        return serve_feed(f"organizer.ics:{uid}", ICS_MIMETYPE, render)
+
+    @app.route('/sitemap.xml', methods=['GET'])
+    @edge_cache.public(_feed_cache_tags)
+    def get_sitemap():
+        """Sitemap listing the public page of every published event."""
+        return serve_feed("sitemap.xml", SITEMAP_MIMETYPE, lambda: render_sitemap(_published_rows()))
@@ -5,8 +5,9 @@ import json
 import traceback
 
 from flask import request, jsonify, current_app
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy.orm import joinedload
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, selectinload
 
 from ..extensions import db
 # Import models using string references to avoid circular imports
@@ -17,12 +18,23 @@ from ..models.event import Event
 from ..models.order import Order, OrderItem
 from ..models.user import User
 from ..models.ticket import Ticket  # Import Ticket model directly
+from ..schemas.fast import compile_schema
 from ..schemas.order_schema import CreateOrderSchema, OrderSchema
+from ..services.inventory import (
+    InsufficientInventory,
+    InvalidOrderItems,
+    notify_sold_out,
+    parse_order_items,
+    reserve_tickets,
+)
+from ..utils.auth import jwt_required
 from ..utils.email import send_order_confirmation
+from ..utils.fieldsets import InvalidFields, column_options, get_requested_fields, schema_variant
+from ..utils.idempotency import idempotent
 from ..utils.qrcode_util import build_ticket_qr_payload
+from ..utils.streaming import get_stream_mode, stream_query
 
-order_schema = OrderSchema()
-orders_schema = OrderSchema(many=True)
+order_schema = compile_schema(OrderSchema())
 create_order_schema = CreateOrderSchema()
 
 def is_free_mode():
@@ -39,111 +51,141 @@ def _uuid(v):
     except Exception:
         return None
 
+def _order_list_options(only):
+    """Loader options for order listings limited to the ``only`` fields.
+
+    Relationships are eager-loaded only when their field is requested;
+    ``items`` also needs ``status`` since unpaid orders hide their items.
+    Items use selectinload, which (unlike a joined collection) also works
+    for streamed listings.
+    """
+    options = column_options(Order, only, depends={"items": ("status",)})
+    if only is None or "event" in only:
+        options.append(joinedload(Order.event))
+    if only is None or "items" in only:
+        options.append(selectinload(Order.items).joinedload(OrderItem.ticket_type))
+    return options
+
 def init_app(app):
     @app.route('/api/orders', methods=['POST'])
     @jwt_required()
+    @idempotent
     def create_order():
         try:
             # Get request data
             data = request.get_json() or {}
-            user_id = get_jwt_identity()
+            user_id = _uuid(get_jwt_identity())
             event_id = data.get('event_id')
+            if not user_id:
+                return {"message": "Invalid token"}, 400
             
             # Basic validation
             if not event_id:
                 return {"message": "Event ID is required"}, 400
+            event_id = _uuid(event_id)
+            if not event_id:
+                return {"message": "Invalid event ID"}, 400
+            try:
+                quantities = parse_order_items(data.get('items'))
+            except InvalidOrderItems as e:
+                return {"message": str(e)}, 400
                 
-            if not data.get('items'):
-                return {"message": "No items provided. Add at least one ticket."}, 400
+            event = (db.session.query(
+                    Event.id, Event.title, Event.start_date, Event.end_date,
+                    Event.venue_name, Event.address,
+                )
+                .filter(Event.id == event_id)
+                .first())
+            if not event:
+                return {"message": "Event not found"}, 404
                 
-            # Create order
-            order = Order(
-                user_id=user_id,
-                event_id=event_id,
-                total_amount=0,
-                status="paid",
-                payment_method="free"
-            )
-            db.session.add(order)
-            db.session.flush()  # Get order ID
-            
-            # First, create all order items
-            order_items = []
-            for item in data.get('items', []):
-                ticket_type_id = item.get('ticket_type_id')
-                quantity = int(item.get('quantity', 1))
+            # Claim the tickets first: the conditional UPDATE fails instead
+            # of overselling, and stays uncommitted until the order is in
+            try:
+                reserved = reserve_tickets(event_id, quantities)
+            except InvalidOrderItems as e:
+                db.session.rollback()
+                return {"message": str(e)}, 400
+            except InsufficientInventory as e:
+                db.session.rollback()
+                return {
+                    "message": str(e),
+                    "ticket_type_id": str(e.ticket_type_id),
+                    "requested": e.requested,
+                    "available": e.remaining,
+                }, 409
                 
-                # Create order item
-                order_item = OrderItem(
-                    order_id=order.id,
-                    ticket_type_id=ticket_type_id,
-                    quantity=quantity,
-                    unit_price=0,  # Free mode
-                    qr_code=f"FREE-{order.id}-{ticket_type_id}"
-                )
-                db.session.add(order_item)
-                order_items.append((order_item, ticket_type_id, quantity))
-            
-            # Commit order and order items first
-            db.session.commit()
-            
-            # Now create tickets with the committed order item IDs
-            for order_item, ticket_type_id, quantity in order_items:
-                for _ in range(quantity):
-                    try:
-                        ticket = Ticket(
-                            order_item_id=order_item.id,
-                            event_id=event_id,
-                            user_id=user_id,
-                            ticket_type_id=ticket_type_id,
-                            status="active",
-                            qr_data=f"FREE-{order.id}-{ticket_type_id}-{uuid4()}"
-                        )
-                        db.session.add(ticket)
-                    except Exception as e:
-                        current_app.logger.error(f"Error creating ticket: {str(e)}")
-                        current_app.logger.error(traceback.format_exc())
-                        db.session.rollback()
-                        return {"message": f"Failed to create ticket: {str(e)}"}, 500
+            # Write the order, its items and every ticket in one transaction
+            # with one multi-row INSERT per table: ids are generated here,
+            # so nothing has to be read back and the statement count does
+            # not grow with the number of tickets
+            order_id = uuid4()
+            now = datetime.utcnow()
+            db.session.execute(insert(Order), [{
+                "id": order_id,
+                "user_id": user_id,
+                "event_id": event_id,
+                "total_amount": 0,
+                "status": "paid",
+                "payment_method": "free",
+                "created_at": now,
+            }])
+            item_rows = [
+                {
+                    "id": uuid4(),
+                    "order_id": order_id,
+                    "ticket_type_id": ticket_type_id,
+                    "quantity": quantity,
+                    "unit_price": 0,  # Free mode
+                    "qr_code": f"FREE-{order_id}-{ticket_type_id}",
+                    "checked_in": False,
+                }
+                for ticket_type_id, quantity in quantities.items()
+            ]
+            db.session.execute(insert(OrderItem), item_rows)
+            db.session.execute(insert(Ticket), [
+                {
+                    "id": uuid4(),
+                    "order_item_id": item["id"],
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "ticket_type_id": item["ticket_type_id"],
+                    "status": "active",
+                    "qr_data": f"FREE-{order_id}-{item['ticket_type_id']}-{uuid4()}",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for item in item_rows
+                for _ in range(item["quantity"])
+            ])
             
-            # Commit tickets
+            # Commit the reservation, order, items and tickets together
             db.session.commit()
+            notify_sold_out(event_id, reserved)
             
-            # Fetch the complete order with relationships
-            from sqlalchemy.orm import joinedload
-            
-            # Query the order with all necessary relationships
-            order_with_details = db.session.query(Order)\
-                .options(
-                    joinedload(Order.event),
-                    joinedload(Order.items).joinedload(OrderItem.ticket_type)
-                )\
-                .filter(Order.id == order.id)\
-                .first()
-            
-            # Format the response
+            # Format the response from what was just written
             response = {
-                "id": str(order.id),
+                "id": str(order_id),
                 "message": "Order created successfully",
                 "status": "paid",
                 "event": {
-                    "id": str(order_with_details.event.id),
-                    "title": order_with_details.event.title,
-                    "start_date": order_with_details.event.start_date.isoformat(),
-                    "end_date": order_with_details.event.end_date.isoformat(),
-                    "venue_name": order_with_details.event.venue_name,
-                    "address": order_with_details.event.address
+                    "id": str(event.id),
+                    "title": event.title,
+                    "start_date": event.start_date.isoformat(),
+                    "end_date": event.end_date.isoformat(),
+                    "venue_name": event.venue_name,
+                    "address": event.address
                 },
                 "items": [
                     {
-                        "id": str(item.id),
-                        "ticket_type_id": str(item.ticket_type_id),
-                        "ticket_type_name": item.ticket_type.name if item.ticket_type else "General Admission",
-                        "quantity": item.quantity,
-                        "unit_price": float(item.unit_price),
-                        "qr_code": item.qr_code
+                        "id": str(item["id"]),
+                        "ticket_type_id": str(item["ticket_type_id"]),
+                        "ticket_type_name": reserved[item["ticket_type_id"]].name or "General Admission",
+                        "quantity": item["quantity"],
+                        "unit_price": float(item["unit_price"]),
+                        "qr_code": item["qr_code"]
                     }
-                    for item in order_with_details.items
+                    for item in item_rows
                 ]
             }
             
@@ -161,21 +203,20 @@ def init_app(app):
         if not user_id:
             return jsonify({"message": "Invalid token"}), 400
             
-        from sqlalchemy.orm import joinedload
+        try:
+            only = get_requested_fields(OrderSchema)
+        except InvalidFields as e:
+            return jsonify({"message": str(e)}), 400
         
-        # Query orders with relationships
+        # Query orders with the relationships the requested fields need
         orders = (Order.query
             .filter_by(user_id=user_id)
-            .options(
-                joinedload(Order.event),
-                joinedload(Order.items).joinedload(OrderItem.ticket_type)
-            )
+            .options(*_order_list_options(only))
             .order_by(Order.created_at.desc())
             .all())
             
         # Use the schema with nested relationships
-        from ..schemas.order_schema import OrderSchema
-        schema = OrderSchema(many=True)
+        schema = schema_variant(OrderSchema, only, many=True)
         return jsonify({"orders": schema.dump(orders)})
 
     @app.route('/api/orders/<order_id>', methods=['GET'])
@@ -216,8 +257,22 @@ def init_app(app):
         if role != "admin" and (not uid or event.organizer_id != uid):
             return jsonify({"message": "Forbidden"}), 403
             
-        orders = Order.query.filter_by(event_id=event.id).order_by(Order.created_at.desc()).all()
-        return jsonify({"orders": orders_schema.dump(orders)})
+        try:
+            only = get_requested_fields(OrderSchema)
+        except InvalidFields as e:
+            return jsonify({"message": str(e)}), 400
+            
+        query = (Order.query
+            .filter_by(event_id=event.id)
+            .options(*_order_list_options(only))
+            .order_by(Order.created_at.desc()))
+        schema = schema_variant(OrderSchema, only, many=True)
+        
+        # Large events: stream row by row instead of building the whole list
+        mode = get_stream_mode()
+        if mode:
+            return stream_query(query, schema, "orders", mode)
+        return jsonify({"orders": schema.dump(query.all())})
 
     @app.route('/api/orders/verify-checkin', methods=['POST'])
     @jwt_required()
@@ -3,15 +3,33 @@ import os
 from uuid import UUID as _UUID, uuid4
 
 from flask import current_app, request, jsonify
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import get_jwt_identity
 from flask_restful import Resource
+from sqlalchemy import insert
 
 from ..extensions import db
 # Import models using string references to avoid circular imports
 from ..models import Event, Order, OrderItem, TicketType
 from ..models.payment import Payment
+from ..models.ticket import Ticket
+from ..services.inventory import (
+    InsufficientInventory,
+    InvalidOrderItems,
+    confirm_holds,
+    hold_tickets,
+    parse_order_items,
+    release_holds,
+    reserve_tickets,
+)
+from ..utils.auth import jwt_required
+from ..utils.idempotency import idempotent
+from ..utils.invalidation import notify_ticket_types_changed
 from ..utils.mpesa import initiate_stk_push
-from ..utils.qrcode_util import generate_ticket_qr, build_ticket_qr_payload
+from ..utils.qrcode_util import build_ticket_qr_payload
+
+
+# Payment outcomes a later callback must not change
+FINAL_PAYMENT_STATUSES = ("success", "failed", "cancelled")
 
 
 def _uuid(v):
@@ -32,6 +50,7 @@ def is_free_mode():
 def init_app(app):
     @app.route('/api/payments/mpesa/initiate', methods=['POST'])
     @jwt_required()
+    @idempotent
     def initiate_mpesa_payment():
         # Block payments if in free mode
         if is_free_mode():
@@ -58,6 +77,11 @@ def init_app(app):
         if not event:
             return jsonify({"message": "Event not found"}), 404
 
+        try:
+            quantities = parse_order_items(data.get("tickets"))
+        except InvalidOrderItems as e:
+            return jsonify({"message": str(e)}), 400
+
         # Create order
         order = Order(
             user_id=user_id,
@@ -66,40 +90,37 @@ def init_app(app):
             total_amount=0,  # Will be updated with ticket amounts
         )
         db.session.add(order)
+        db.session.flush()  # Get order ID
+
+        # Hold the tickets until the payment completes or the hold expires;
+        # the claim is atomic and nothing stays locked during the STK push
+        try:
+            reserved = hold_tickets(
+                event_id, quantities, order.id, current_app.config.get("HOLD_TTL_SECONDS", 600)
+            )
+        except InvalidOrderItems as e:
+            db.session.rollback()
+            return jsonify({"message": str(e)}), 400
+        except InsufficientInventory as e:
+            db.session.rollback()
+            return jsonify({
+                "message": str(e),
+                "ticket_type_id": str(e.ticket_type_id),
+                "available": e.remaining,
+            }), 409
 
         # Process ticket types
         total_amount = 0
-        for item in data.get("tickets", []):
-            ticket_type_id = item.get("ticket_type_id")
-            if not ticket_type_id:
-                db.session.rollback()
-                return jsonify({"message": "Ticket type ID is required"}), 400
-                
-            ticket_type = TicketType.query.get(_uuid(ticket_type_id))
-            if not ticket_type or ticket_type.event_id != event_id:
-                db.session.rollback()
-                return jsonify({"message": f"Invalid ticket type ID: {ticket_type_id}"}), 400
-
-            quantity = int(item.get("quantity", 1))
-            if quantity < 1:
-                continue
-
-            # Check ticket availability
-            if ticket_type.quantity_available is not None and quantity > ticket_type.quantity_available:
-                db.session.rollback()
-                return jsonify({
-                    "message": f"Not enough tickets available for {ticket_type.name}"
-                }), 400
-
-            # Create order item
+        for ticket_type_id, quantity in quantities.items():
+            price = reserved[ticket_type_id].price
             order_item = OrderItem(
                 order=order,
-                ticket_type=ticket_type,
+                ticket_type_id=ticket_type_id,
                 quantity=quantity,
-                price=ticket_type.price,
+                unit_price=price,
             )
             db.session.add(order_item)
-            total_amount += ticket_type.price * quantity
+            total_amount += price * quantity
 
         if total_amount <= 0:
             db.session.rollback()
@@ -147,7 +168,7 @@ def init_app(app):
             order=order,
             amount=total_amount,
             provider="mpesa",
-            status="pending",
+            status="initiated",
             phone=phone,
         )
         db.session.add(payment)
@@ -157,24 +178,31 @@ def init_app(app):
         try:
             response = initiate_stk_push(
                 phone_msisdn=phone,
-                amount_kes=total_amount,
+                amount_kes=(total_amount + 99) // 100,  # prices are in cents
                 account_ref=f"EVENT{event_id}",
                 description=f"Payment for {event.title}",
-                amount=total_amount,
-                account_reference=f"EVENT-{event.id}",
-                callback_url=f"{app.config.get('BASE_URL')}/api/payments/mpesa/callback"
             )
-            payment.provider_reference = response.get("CheckoutRequestID")
-            db.session.commit()
-            return jsonify({
-                "message": "Payment initiated", 
-                "payment_id": str(payment.id)
-            })
         except Exception as e:
-            db.session.rollback()
             app.logger.error(f"Failed to initiate M-Pesa payment: {str(e)}")
+            # Nothing was charged: give the held tickets back now
+            payment.status = "failed"
+            order.status = "cancelled"
+            released = release_holds(order.id)
+            db.session.commit()
+            for eid in released:
+                notify_ticket_types_changed(eid)
             return jsonify({"message": "Failed to initiate payment"}), 500
 
+        # The callback finds the payment by its CheckoutRequestID
+        payment.status = "processing"
+        payment.merchant_request_id = response.get("MerchantRequestID")
+        payment.checkout_request_id = response.get("CheckoutRequestID")
+        db.session.commit()
+        return jsonify({
+            "message": "Payment initiated", 
+            "payment_id": str(payment.id)
+        })
+
     @app.route('/api/payments/<payment_id>/status', methods=['GET'])
     @jwt_required()
     def get_payment_status(payment_id):
@@ -192,12 +220,11 @@ def init_app(app):
             "amount": payment.amount,
             "provider": payment.provider,
             "created_at": payment.created_at.isoformat(),
-            "updated_at": payment.updated_at.isoformat(),
         })
 
     @app.route('/api/payments/mpesa/callback', methods=['POST'])
     def mpesa_callback():
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         app.logger.info(f"M-Pesa callback received: {data}")
 
         # Verify the callback is from M-Pesa
@@ -213,36 +240,91 @@ def init_app(app):
             return jsonify({"message": "Invalid callback"}), 400
 
         # Find the payment
-        payment = Payment.query.filter_by(provider_reference=checkout_request_id).first()
+        payment = Payment.query.filter_by(checkout_request_id=checkout_request_id).first()
         if not payment:
             app.logger.error(f"Payment not found for CheckoutRequestID: {checkout_request_id}")
             return jsonify({"message": "Payment not found"}), 404
 
-        # Update payment status based on M-Pesa response
-        if result_code == "0":
-            payment.status = "completed"
-            payment.order.status = "completed"
-            # Generate QR codes for tickets
-            for item in payment.order.items:
-                for _ in range(item.quantity):
-                    # Generate QR code with ticket details
-                    ticket_data = {
-                        "order_id": str(payment.order.id),
-                        "ticket_type_id": str(item.ticket_type_id),
-                        "event_id": str(item.ticket_type.event_id),
-                    }
-                    qr_code_url = generate_ticket_qr(ticket_data)
-                    # In a real app, you would save this QR code URL to a ticket record
-                    current_app.logger.exception(f"mpesa.callback ticket processing failed: {str(e)}")
-                    db.session.rollback()
-                    # Re-raise to trigger the outer exception handler
-                    raise
+        # M-Pesa redelivers callbacks: only the first outcome counts
+        if payment.status in FINAL_PAYMENT_STATUSES:
+            return {"message": "ok"}, 200
+
+        order = payment.order
+        payment.result_code = str(result_code)
+        payment.result_desc = (result.get("ResultDesc") or "")[:255]
+        payment.raw_callback = json.dumps(data)
+        released = set()
+
+        # Update payment status based on M-Pesa response (0 means paid)
+        if str(result_code) == "0":
+            payment.status = "success"
+            if confirm_holds(order.id):
+                order.status = "paid"
+            else:
+                # Whoever deleted the holds decides; the sweeper may have
+                # just expired the order
+                db.session.refresh(order, ["status"])
+                if order.status == "expired":
+                    # Paid after the hold lapsed: sell the tickets outright
+                    # if they are still there, all or nothing
+                    try:
+                        with db.session.begin_nested():
+                            reserve_tickets(
+                                order.event_id,
+                                {item.ticket_type_id: item.quantity for item in order.items},
+                            )
+                        order.status = "paid"
+                    except (InsufficientInventory, InvalidOrderItems) as e:
+                        app.logger.error(f"Paid order {order.id} could not be fulfilled: {str(e)}")
+                        order.status = "refund_pending"
+                elif order.status == "pending":
+                    # Reserved as sold when created, before holds existed
+                    order.status = "paid"
+            if order.status == "paid":
+                _issue_tickets(order)
         else:
-            p.status = "failed"
+            payment.status = "failed"
+            if order.status == "pending":
+                order.status = "cancelled"
+            released = release_holds(order.id)
         db.session.commit()
+        for event_id in released:
+            notify_ticket_types_changed(event_id)
         return {"message": "ok"}, 200
 
 
+def _issue_tickets(order):
+    """Give a paid order's items their QR payloads and write its tickets
+    with one multi-row INSERT."""
+    event = order.event
+    rows = []
+    for item in order.items:
+        item.qr_code = build_ticket_qr_payload(
+            order_id=order.id,
+            item_id=item.id,
+            user_id=order.user_id,
+            event_id=order.event_id,
+            event_title=event.title if event else None,
+            event_start_date_iso=event.start_date.isoformat() if event and event.start_date else None,
+            ticket_type_id=item.ticket_type_id,
+            ticket_type_name=item.ticket_type.name if item.ticket_type else None,
+        )
+        rows.extend(
+            {
+                "id": uuid4(),
+                "order_item_id": item.id,
+                "event_id": order.event_id,
+                "user_id": order.user_id,
+                "ticket_type_id": item.ticket_type_id,
+                "status": "active",
+                "qr_data": item.qr_code,
+            }
+            for _ in range(item.quantity)
+        )
+    if rows:
+        db.session.execute(insert(Ticket), rows)
+
+
 class MpesaTestEnvResource(Resource):
     def get(self):
         """Test endpoint to check M-Pesa environment variables"""
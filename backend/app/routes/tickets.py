@@ -2,20 +2,30 @@ from uuid import UUID as _UUID
 from functools import wraps
 
 from flask import request, jsonify, current_app
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required, verify_jwt_in_request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from marshmallow import ValidationError
+from sqlalchemy import func
 
 from ..extensions import db
 from ..models.event import Event
 from ..models.ticket import TicketType
 from ..models.order import OrderItem
+from ..schemas.fast import compile_schema
 from ..schemas.ticket_schema import (
     TicketTypeCreateSchema,
     TicketTypeSchema,
     TicketTypeUpdateSchema,
 )
+from ..services.availability import availability_snapshot
+from ..services.inventory import lock_inventory, shard_ticket_type
+from ..utils.auth import jwt_required, verify_jwt_in_request
+from ..utils.batch import InvalidIds, fetch_by_ids, get_requested_ids
+from ..utils.conditional import conditional, make_etag
+from ..utils.edge_cache import edge_cache
+from ..utils.fieldsets import InvalidFields, column_options, get_requested_fields, schema_variant
+from ..utils.invalidation import notify_ticket_types_changed
 
-ticket_schema = TicketTypeSchema()
-tickets_schema = TicketTypeSchema(many=True)
+ticket_schema = compile_schema(TicketTypeSchema())
 ticket_create_schema = TicketTypeCreateSchema()
 ticket_update_schema = TicketTypeUpdateSchema()
 
@@ -37,8 +47,79 @@ def _uuid(v):
     except Exception:
         return None
 
+def _event_tickets_validators(event_id):
+    eid = _uuid(event_id)
+    if not eid:
+        return None
+    row = (
+        db.session.query(func.max(TicketType.updated_at), func.count(TicketType.id))
+        .select_from(Event)
+        .outerjoin(TicketType, TicketType.event_id == Event.id)
+        .filter(Event.id == eid)
+        .group_by(Event.id)
+        .first()
+    )
+    if row is None:
+        return None
+    last_modified, count = row
+    return make_etag("event-tickets", eid, last_modified, count), last_modified
+
+def _event_tickets_cache_tags(event_id):
+    eid = _uuid(event_id)
+    return [f"event:{eid}"] if eid else None
+
+
+def _availability_cache_tags():
+    return ["availability"]
+
+
 def init_app(app):
+    @app.route('/api/availability', methods=['GET'])
+    @edge_cache.public(_availability_cache_tags, max_age=5, s_maxage=5, stale_while_revalidate=10)
+    def get_availability():
+        """Remaining tickets for many events: ``?event_ids=a,b,c``.
+
+        Served from the shared availability snapshot, so numbers may lag
+        sales by up to ``AVAILABILITY_TTL`` seconds.
+        """
+        try:
+            ids = get_requested_ids("event_ids")
+        except InvalidIds as e:
+            return jsonify({"message": str(e)}), 400
+        if not ids:
+            return jsonify({"message": "event_ids is required"}), 400
+            
+        return jsonify({"availability": availability_snapshot.get_many(ids)})
+
+    @app.route('/api/ticket-types', methods=['GET'])
+    def get_ticket_types():
+        """Resolve ticket types by id: ``?ids=a,b,c`` in one IN query."""
+        try:
+            ids = get_requested_ids()
+            only = get_requested_fields(TicketTypeSchema)
+        except (InvalidIds, InvalidFields) as e:
+            return jsonify({"message": str(e)}), 400
+        if ids is None:
+            return jsonify({"message": "ids is required"}), 400
+            
+        tickets, missing = fetch_by_ids(
+            TicketType.query.options(*column_options(
+                TicketType, only,
+                depends={"quantity_available": ("quantity_total", "quantity_sold", "quantity_held", "inventory_shards")},
+            )),
+            TicketType.id,
+            ids,
+        )
+        return jsonify({
+            "items": schema_variant(TicketTypeSchema, only, many=True).dump(tickets),
+            "missing": missing,
+        })
+
     @app.route('/api/events/<event_id>/tickets', methods=['GET'])
+    # Sales change the remaining counts without a purge (only sell-outs
+    # signal), so keep the CDN copy as short-lived as /api/availability
+    @edge_cache.public(_event_tickets_cache_tags, max_age=5, s_maxage=5, stale_while_revalidate=10)
+    @conditional(_event_tickets_validators)
     def get_event_tickets(event_id):
         eid = _uuid(event_id)
         if not eid:
@@ -48,8 +129,19 @@ def init_app(app):
         if not event:
             return jsonify({"message": "Event not found"}), 404
             
-        tickets = TicketType.query.filter_by(event_id=eid).all()
-        return jsonify(tickets_schema.dump(tickets))
+        try:
+            only = get_requested_fields(TicketTypeSchema)
+        except InvalidFields as e:
+            return jsonify({"message": str(e)}), 400
+            
+        tickets = (TicketType.query
+            .filter_by(event_id=eid)
+            .options(*column_options(
+                TicketType, only,
+                depends={"quantity_available": ("quantity_total", "quantity_sold", "quantity_held", "inventory_shards")},
+            ))
+            .all())
+        return jsonify(schema_variant(TicketTypeSchema, only, many=True).dump(tickets))
         
     @app.route('/api/events/<event_id>/tickets', methods=['POST'])
     @jwt_required()
@@ -94,6 +186,7 @@ def init_app(app):
         
         db.session.add(ticket)
         db.session.commit()
+        notify_ticket_types_changed(eid)
         
         return jsonify(ticket_schema.dump(ticket)), 201
 
@@ -121,11 +214,20 @@ def init_app(app):
         if claims.get("role") != "admin" and str(event.organizer_id) != get_jwt_identity():
             return jsonify({"message": "Not authorized to update this ticket"}), 403
             
-        # Validate input
-        data = request.get_json() or {}
-        errors = ticket_update_schema.validate(data)
-        if errors:
-            return jsonify({"errors": errors}), 400
+        # Validate input; the loaded values are typed (ints, datetimes)
+        try:
+            data = ticket_update_schema.load(request.get_json() or {})
+        except ValidationError as e:
+            return jsonify({"errors": e.messages}), 400
+            
+        if "quantity_total" in data:
+            # Counted under lock, from the shards for sharded types
+            ticket, claimed = lock_inventory(ticket.id)
+            if data["quantity_total"] < claimed:
+                db.session.rollback()
+                return jsonify({"errors": {"quantity_total": [
+                    f"Must be at least {claimed}, the tickets already sold or held"
+                ]}}), 400
             
         # Update ticket
         for field in ["name", "description", "price", "quantity_total", 
@@ -134,7 +236,16 @@ def init_app(app):
             if field in data:
                 setattr(ticket, field, data[field])
                 
+        # Sharded stock is re-split whenever the total or shard count changes
+        shards = data.get("inventory_shards", ticket.inventory_shards)
+        if shards > current_app.config.get("INVENTORY_SHARDS_MAX", 64):
+            db.session.rollback()
+            return jsonify({"errors": {"inventory_shards": ["Too many shards"]}}), 400
+        if shards != ticket.inventory_shards or (shards and "quantity_total" in data):
+            ticket = shard_ticket_type(ticket.id, shards)
+            
         db.session.commit()
+        notify_ticket_types_changed(eid)
         return jsonify(ticket_schema.dump(ticket))
         
     @app.route('/api/events/<event_id>/tickets/<ticket_id>', methods=['DELETE'])
@@ -172,6 +283,7 @@ def init_app(app):
             
         db.session.delete(ticket)
         db.session.commit()
+        notify_ticket_types_changed(eid)
         
         return jsonify({"message": "Ticket type deleted successfully"}), 200
 
@@ -1,8 +1,9 @@
 from flask import current_app, request, jsonify
-from flask_jwt_extended import get_jwt, jwt_required
+from flask_jwt_extended import get_jwt
 
 from ..extensions import db
 from ..models.media import Media
+from ..utils.auth import jwt_required
 from ..utils.cloudinary import upload_image
 
 def init_app(app):
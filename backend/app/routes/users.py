@@ -1,14 +1,17 @@
 from uuid import UUID as _UUID
 
 from flask import request, jsonify
-from flask_jwt_extended import get_jwt, jwt_required
+from flask_jwt_extended import get_jwt
 
 from ..extensions import db
 from ..models.user import User
 from ..schemas import UserSchema
+from ..schemas.fast import compile_schema
+from ..utils.auth import jwt_required
+from ..utils.streaming import get_stream_mode, stream_query
 
 user_schema = UserSchema()
-users_schema = UserSchema(many=True)
+users_schema = compile_schema(UserSchema(many=True))
 
 def _uuid(v):
     try:
@@ -25,8 +28,11 @@ def init_app(app):
         if role != "admin":
             return jsonify({"message": "Forbidden"}), 403
             
-        users = User.query.order_by(User.created_at.desc()).all()
-        return jsonify({"users": users_schema.dump(users)})
+        query = User.query.order_by(User.created_at.desc())
+        mode = get_stream_mode()
+        if mode:
+            return stream_query(query, users_schema, "users", mode)
+        return jsonify({"users": users_schema.dump(query.all())})
 
     @app.route('/api/users/<user_id>/role', methods=['PUT'])
     @jwt_required()
@@ -0,0 +1,119 @@
+"""Precompiled dump functions for hot marshmallow schemas.
+
+Marshmallow resolves every field through several layers of generic calls
+(``Field.serialize`` -> ``get_value`` -> ``_serialize``) for each object it
+dumps. :func:`compile_schema` walks a schema instance once and generates a
+plain Python function doing the same work inline, with fast paths for the
+field types used by our schemas and ``Field._serialize`` as the fallback
+for anything else, so the output is identical to ``schema.dump``.
+"""
+from collections.abc import Mapping
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+# Field types whose serialization is ``None`` passthrough plus a cheap
+# expression on the value. Exact types only: subclasses may override.
+_STRING_TYPES = (fields.String, fields.Email, fields.Url)
+
+
+def _compilable(schema):
+    """Whether ``schema.dump`` is nothing more than its fields' output."""
+    return not (
+        schema._has_processors(PRE_DUMP)
+        or schema._has_processors(POST_DUMP)
+        or type(schema).get_attribute is not Schema.get_attribute
+    )
+
+
+def _value_expr(field, ref, name):
+    """Python expression serializing the non-None local ``v`` for ``field``.
+
+    ``ref`` suffixes the names the field (``f_``) and its compiled nested
+    serializer (``n_``) are bound to in the generated function's namespace.
+    """
+    kind = type(field)
+    if kind in _STRING_TYPES:
+        return f"v if v.__class__ is str else f_{ref}._serialize(v, {name!r}, obj)"
+    if kind is fields.UUID:
+        return "str(v)"
+    if kind is fields.Integer and not field.as_string:
+        return "int(v)"
+    if kind is fields.Boolean:
+        return f"v if v.__class__ is bool else f_{ref}._serialize(v, {name!r}, obj)"
+    if kind is fields.DateTime and field.format in (None, "iso", "iso8601"):
+        return "v.isoformat()"
+    if kind is fields.Nested and _compilable(field.schema):
+        if field.schema.many or field.many:
+            return f"[n_{ref}(x) for x in v]"
+        return f"n_{ref}(v)"
+    return None
+
+
+def _compile_one(schema):
+    """Generate ``serialize(obj) -> dict`` for a single object of ``schema``."""
+    namespace = {"missing": missing, "Mapping": Mapping, "slow": schema.dump}
+    lines = [
+        "def serialize(obj):",
+        # Mappings go through marshmallow's own accessor rules
+        "    if isinstance(obj, Mapping):",
+        "        return slow(obj, many=False)",
+        "    out = {}",
+    ]
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        attr = field.attribute or name
+        ident = str(index)
+        namespace[f"f_{ident}"] = field
+
+        if type(field) is fields.Method:
+            namespace[f"m_{ident}"] = field._serialize_method
+            if field._serialize_method is None:
+                continue
+            lines.append(f"    out[{key!r}] = m_{ident}(obj)")
+            continue
+
+        expr = _value_expr(field, ident, name)
+        if expr is not None and type(field) is fields.Nested:
+            namespace[f"n_{ident}"] = _compile_one(field.schema)
+        simple = "." not in attr and field.dump_default is missing
+        if expr is None or not simple:
+            lines.append(f"    v = f_{ident}.serialize({name!r}, obj, accessor=get_attribute)")
+            lines.append("    if v is not missing:")
+            lines.append(f"        out[{key!r}] = v")
+            continue
+        lines.append(f"    v = getattr(obj, {attr!r}, missing)")
+        lines.append("    if v is not missing:")
+        lines.append(f"        out[{key!r}] = None if v is None else {expr}")
+    lines.append("    return out")
+
+    namespace["get_attribute"] = schema.get_attribute
+    exec(compile("\n".join(lines), f"<compiled {type(schema).__name__}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+class CompiledSchema:
+    """Drop-in ``dump`` replacement built from a marshmallow schema instance.
+
+    Schemas with ``pre_dump``/``post_dump`` hooks or a custom
+    ``get_attribute`` are not compiled; their ``dump`` is used as is.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.many = schema.many
+        self._one = _compile_one(schema) if _compilable(schema) else None
+
+    def dump(self, obj, *, many=None):
+        many = self.many if many is None else bool(many)
+        if self._one is None or obj is None:
+            return self.schema.dump(obj, many=many)
+        if many:
+            one = self._one
+            return [one(o) for o in obj]
+        return self._one(obj)
+
+
+def compile_schema(schema):
+    """Compile a schema instance (``only``/``exclude``/``many`` included)."""
+    return CompiledSchema(schema)
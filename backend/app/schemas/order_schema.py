@@ -1,6 +1,7 @@
 from marshmallow import Schema, fields, EXCLUDE
 from ..utils.qrcode_util import generate_ticket_qr
 from ..models.ticket import TicketType
+from .fast import compile_schema
 
 class TicketTypeSchema(Schema):
     class Meta:
@@ -48,6 +49,9 @@ class OrderItemSchema(Schema):
             return obj.qr_code
         return None
 
+# Shared by every OrderSchema dump instead of a new schema per order
+order_items_schema = compile_schema(OrderItemSchema(many=True))
+
 class OrderSchema(Schema):
     class Meta:
         unknown = EXCLUDE
@@ -64,7 +68,7 @@ class OrderSchema(Schema):
 
     def get_items(self, obj):
         if getattr(obj, "status", None) == "paid":
-            return OrderItemSchema(many=True).dump(getattr(obj, "items", []) or [])
+            return order_items_schema.dump(getattr(obj, "items", []) or [])
         return []
 
 class CreateOrderSchema(Schema):
@@ -8,6 +8,8 @@ class TicketTypeSchema(Schema):
     price = fields.Int(required=True)
     quantity_total = fields.Int(required=True)
     quantity_sold = fields.Int(dump_only=True)
+    quantity_available = fields.Int(dump_only=True)
+    inventory_shards = fields.Int(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
@@ -28,3 +30,4 @@ class TicketTypeUpdateSchema(Schema):
     name = fields.Str(validate=validate.Length(min=1, max=100))
     price = fields.Int()
     quantity_total = fields.Int()
+    inventory_shards = fields.Int(validate=validate.Range(min=0))
@@ -0,0 +1,95 @@
+import threading
+from uuid import UUID
+
+from ..extensions import db
+from ..models.ticket import TicketType
+from ..utils.cache import TTLCache
+from ..utils.invalidation import ticket_types_changed
+
+
+class AvailabilitySnapshot:
+    """Short-lived, shared view of remaining tickets per event.
+
+    Entries live for ``AVAILABILITY_TTL`` seconds. Expired or unknown events
+    requested together are reloaded by one query, and only one thread
+    reloads at a time: concurrent requests wait for that refresh and reuse
+    its result instead of issuing their own reads.
+    """
+
+    def __init__(self, ttl=5, maxsize=10000):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._refresh_lock = threading.Lock()
+
+    def init_app(self, app):
+        self._entries = TTLCache(
+            maxsize=app.config.get("AVAILABILITY_MAXSIZE", 10000),
+            ttl=app.config.get("AVAILABILITY_TTL", 5),
+        )
+
+    def invalidate(self, event_id):
+        self._entries.delete(str(event_id))
+
+    def _load(self, event_ids):
+        rows = (
+            db.session.query(
+                TicketType.event_id,
+                TicketType.id,
+                TicketType.name,
+                TicketType.quantity_total,
+                TicketType.quantity_available,
+            )
+            .filter(TicketType.event_id.in_([UUID(eid) for eid in event_ids]))
+            .order_by(TicketType.event_id, TicketType.created_at)
+            .all()
+        )
+        snapshot = {eid: {"remaining": 0, "total": 0, "ticket_types": []} for eid in event_ids}
+        for event_id, ticket_id, name, total, remaining in rows:
+            entry = snapshot[str(event_id)]
+            entry["ticket_types"].append({
+                "id": str(ticket_id),
+                "name": name,
+                "remaining": remaining,
+                "total": total,
+            })
+            entry["remaining"] += remaining
+            entry["total"] += total
+        for entry in snapshot.values():
+            entry["sold_out"] = entry["total"] > 0 and entry["remaining"] == 0
+        return snapshot
+
+    def get_many(self, event_ids):
+        """Availability for each of ``event_ids`` (UUIDs or strings), keyed by
+        the string id. Events without ticket types report zero totals."""
+        result, stale = {}, []
+        for eid in map(str, event_ids):
+            entry = self._entries.get(eid)
+            if entry is None:
+                stale.append(eid)
+            else:
+                result[eid] = entry
+        if not stale:
+            return result
+
+        with self._refresh_lock:
+            # Whoever held the lock may have just loaded some of these
+            missing = []
+            for eid in stale:
+                entry = self._entries.get(eid)
+                if entry is None:
+                    missing.append(eid)
+                else:
+                    result[eid] = entry
+            if missing:
+                for eid, entry in self._load(missing).items():
+                    self._entries.set(eid, entry)
+                    result[eid] = entry
+        return result
+
+
+availability_snapshot = AvailabilitySnapshot()
+
+
+@ticket_types_changed.connect
+def _on_ticket_types_changed(sender, event_id=None, **extra):
+    if event_id is not None:
+        availability_snapshot.invalidate(event_id)
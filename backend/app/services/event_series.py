@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime
+from itertools import islice
+
+from dateutil.rrule import rrulestr
+from sqlalchemy import insert
+
+from ..extensions import db
+from ..models.event import Event
+from ..models.ticket import TicketType
+
+# Event columns copied onto clones; dates, ids and timestamps are set per copy
+COPIED_EVENT_COLUMNS = (
+    "organizer_id", "title", "description", "category", "venue_name",
+    "address", "banner_image_url",
+)
+
+
+class InvalidSeries(ValueError):
+    pass
+
+
+def series_starts(source, spec, limit, include_source=False):
+    """Start dates of a recurring series described by an RRULE string.
+
+    The rule is anchored on the source event's start date (``DTSTART``), so
+    ``FREQ=WEEKLY;COUNT=52`` yields the source date and the 51 weeks after
+    it. The source's own occurrence is skipped unless ``include_source``.
+
+    Raises:
+        InvalidSeries: If the rule does not parse, yields nothing or yields
+            more than ``limit`` occurrences (including unbounded rules).
+    """
+    if not isinstance(spec, str) or not spec.strip():
+        raise InvalidSeries("rrule is required, e.g. FREQ=WEEKLY;COUNT=52")
+    try:
+        rule = rrulestr(spec.strip(), dtstart=source.start_date)
+    except (ValueError, TypeError) as e:
+        raise InvalidSeries(f"Invalid rrule: {str(e)}")
+    # One spare occurrence for the source itself, one to detect overflow
+    starts = [
+        start for start in islice(rule, limit + 2)
+        if include_source or start != source.start_date
+    ]
+    if len(starts) > limit:
+        raise InvalidSeries(f"A series can create at most {limit} events")
+    if not starts:
+        raise InvalidSeries("rrule yields no new occurrences")
+    return starts
+
+
+def clone_event(source, starts, is_published=False, title=None, copy_ticket_types=True):
+    """Copy ``source`` (and its ticket types) once per start date.
+
+    Every copy keeps the source's duration and starts with nothing sold.
+    All events are written with one multi-row INSERT and all ticket types
+    with another, inside a single transaction, instead of an ORM flush and
+    commit per object.
+
+    Returns:
+        list: The new events as transient :class:`Event` objects, in
+        ``starts`` order, for serialization without reloading them.
+    """
+    now = datetime.utcnow()
+    duration = source.end_date - source.start_date
+    template = {column: getattr(source, column) for column in COPIED_EVENT_COLUMNS}
+    if title:
+        template["title"] = title
+
+    event_rows = [
+        dict(
+            template,
+            id=uuid.uuid4(),
+            start_date=start,
+            end_date=start + duration,
+            is_published=is_published,
+            created_at=now,
+            updated_at=now,
+        )
+        for start in starts
+    ]
+
+    ticket_rows = []
+    if copy_ticket_types:
+        ticket_types = (
+            db.session.query(TicketType.name, TicketType.price, TicketType.quantity_total)
+            .filter(TicketType.event_id == source.id)
+            .order_by(TicketType.created_at)
+            .all()
+        )
+        ticket_rows = [
+            {
+                "id": uuid.uuid4(),
+                "event_id": row["id"],
+                "name": name,
+                "price": price,
+                "quantity_total": quantity_total,
+                "quantity_sold": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in event_rows
+            for name, price, quantity_total in ticket_types
+        ]
+
+    try:
+        db.session.execute(insert(Event), event_rows)
+        if ticket_rows:
+            db.session.execute(insert(TicketType), ticket_rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return [Event(**row) for row in event_rows]
@@ -0,0 +1,569 @@
+import random
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+
+from ..extensions import db
+from ..models.order import Order
+from ..models.ticket import InventoryHold, TicketType, TicketTypeShard
+from ..utils.invalidation import notify_ticket_types_changed
+
+
+# reserve_tickets() result for a sharded ticket type; ``shards`` maps the
+# shard numbers claimed from to the quantity taken from each
+ShardedReservation = namedtuple("ShardedReservation", "id name price remaining shards")
+
+
+class InvalidOrderItems(ValueError):
+    pass
+
+
+class QuantityBelowClaimed(ValueError):
+    """Raised when ``quantity_total`` would drop below the tickets already
+    sold or held."""
+
+    def __init__(self, ticket_type_id, quantity_total, claimed):
+        super().__init__(f"quantity_total {quantity_total} is below the {claimed} tickets already sold or held")
+        self.ticket_type_id = ticket_type_id
+        self.quantity_total = quantity_total
+        self.claimed = claimed
+
+
+class InsufficientInventory(Exception):
+    """Raised when a ticket type cannot cover the requested quantity."""
+
+    def __init__(self, ticket_type_id, name, requested, remaining):
+        super().__init__(f"Not enough tickets available for {name}")
+        self.ticket_type_id = ticket_type_id
+        self.name = name
+        self.requested = requested
+        self.remaining = remaining
+
+
+def parse_order_items(items, id_key="ticket_type_id"):
+    """Validate requested order lines into ``{ticket_type_id: quantity}``.
+
+    Lines for the same ticket type are merged, in request order.
+
+    Raises:
+        InvalidOrderItems: On a missing/invalid ticket type id or a
+            quantity that is not a positive integer.
+    """
+    if not isinstance(items, list) or not items:
+        raise InvalidOrderItems("No items provided. Add at least one ticket.")
+    quantities = {}
+    for item in items:
+        if not isinstance(item, dict):
+            raise InvalidOrderItems("Each item must be an object")
+        try:
+            ticket_type_id = UUID(str(item.get(id_key)))
+        except ValueError:
+            raise InvalidOrderItems(f"Invalid ticket type ID: {item.get(id_key)}")
+        try:
+            quantity = int(item.get("quantity", 1))
+        except (TypeError, ValueError):
+            raise InvalidOrderItems("Quantity must be a whole number")
+        if quantity < 1:
+            raise InvalidOrderItems("Quantity must be at least 1")
+        quantities[ticket_type_id] = quantities.get(ticket_type_id, 0) + quantity
+    return quantities
+
+
+def _per_ticket_type(quantities):
+    """``CASE id WHEN ... THEN n END`` for a ``{ticket_type_id: n}`` map."""
+    return case(
+        *[(TicketType.id == ticket_type_id, n) for ticket_type_id, n in quantities.items()],
+        else_=0,
+    )
+
+
+def reserve_tickets(event_id, quantities, held=False):
+    """Take ``quantities`` ({ticket_type_id: n}) out of an event's inventory.
+
+    Every line is claimed by one conditional UPDATE::
+
+        UPDATE ticket_types
+           SET quantity_sold = quantity_sold + CASE id WHEN ... END
+         WHERE id IN (...) AND event_id = :event_id
+           AND quantity_total - quantity_sold - quantity_held >= CASE id WHEN ... END
+        RETURNING id, name, price, quantity_total - quantity_sold - quantity_held
+
+    The availability check and the increment happen under the row lock the
+    UPDATE takes, so concurrent buyers can never oversell; there is no
+    read-then-write window. The caller's transaction is left open: commit it
+    together with the order, or roll it back to release the tickets.
+
+    Sharded ticket types (``inventory_shards > 0``) are skipped by that
+    UPDATE and claimed from their shard rows instead; see
+    :func:`_claim_from_shards`.
+
+    Args:
+        held: Count the tickets in ``quantity_held`` instead of
+            ``quantity_sold`` (use :func:`hold_tickets` to also record the
+            hold).
+
+    Returns:
+        dict: ``{ticket_type_id: row}`` with ``name``, ``price`` and
+        ``remaining`` (after this reservation) for each ticket type;
+        a :class:`ShardedReservation` for sharded ones.
+
+    Raises:
+        InvalidOrderItems: If a ticket type does not belong to the event.
+        InsufficientInventory: If a ticket type has too few tickets left.
+            Other lines may already be claimed in the open transaction,
+            so the session must be rolled back.
+    """
+    requested = _per_ticket_type(quantities)
+    remaining = TicketType.quantity_total - TicketType.quantity_sold - TicketType.quantity_held
+    column = TicketType.quantity_held if held else TicketType.quantity_sold
+    stmt = (
+        update(TicketType)
+        .where(
+            TicketType.id.in_(list(quantities)),
+            TicketType.event_id == event_id,
+            TicketType.inventory_shards == 0,
+            remaining >= requested,
+        )
+        .values({column: column + requested, TicketType.updated_at: datetime.utcnow()})
+        .returning(TicketType.id, TicketType.name, TicketType.price, remaining.label("remaining"))
+        .execution_options(synchronize_session=False)
+    )
+    reserved = {row.id: row for row in db.session.execute(stmt)}
+    if len(reserved) == len(quantities):
+        return reserved
+
+    # Work out which line failed (for the error message) before giving up,
+    # and which lines are sharded rather than short
+    missing = [ticket_type_id for ticket_type_id in quantities if ticket_type_id not in reserved]
+    rows = {
+        row.id: row
+        for row in db.session.query(
+            TicketType.id, TicketType.name, TicketType.price, TicketType.event_id,
+            TicketType.inventory_shards, TicketType.quantity_available.label("remaining"),
+        ).filter(TicketType.id.in_(missing))
+    }
+    for ticket_type_id in missing:
+        row = rows.get(ticket_type_id)
+        if row is None or row.event_id != event_id:
+            raise InvalidOrderItems(f"Invalid ticket type ID: {ticket_type_id}")
+    short = [ticket_type_id for ticket_type_id in missing if not rows[ticket_type_id].inventory_shards]
+    if short:
+        row = rows[short[0]]
+        raise InsufficientInventory(row.id, row.name, quantities[row.id], row.remaining)
+    for ticket_type_id in missing:
+        reserved[ticket_type_id] = _claim_from_shards(rows[ticket_type_id], quantities[ticket_type_id])
+    return reserved
+
+
+def _claim_from_shards(ticket_type, quantity):
+    """Take ``quantity`` tickets from a sharded ticket type.
+
+    The fast path is one UPDATE on a single shard, picked at random among
+    those with enough spare stock and not locked by another buyer::
+
+        UPDATE ticket_type_shards SET quantity_sold = quantity_sold + :n
+         WHERE ticket_type_id = :id AND quantity_total - quantity_sold >= :n
+           AND shard = (SELECT shard ... ORDER BY (shard + :offset) % :shards
+                        LIMIT 1 FOR UPDATE SKIP LOCKED)
+
+    When no single shard can cover the order (stock is running out, or every
+    shard with stock is busy) all shards are locked in order and the
+    quantity is split across them.
+    """
+    shards = ticket_type.inventory_shards
+    own = TicketTypeShard.ticket_type_id == ticket_type.id
+    spare = TicketTypeShard.quantity_total - TicketTypeShard.quantity_sold
+    pick = (
+        select(TicketTypeShard.shard)
+        .where(own, spare >= quantity)
+        .order_by((TicketTypeShard.shard + random.randrange(shards)) % shards)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        update(TicketTypeShard)
+        .where(own, TicketTypeShard.shard == pick, spare >= quantity)
+        .values(quantity_sold=TicketTypeShard.quantity_sold + quantity)
+        .returning(TicketTypeShard.shard, spare.label("remaining"))
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is not None:
+        claimed, remaining = {row.shard: quantity}, row.remaining
+    else:
+        locked = db.session.execute(
+            select(TicketTypeShard.shard, spare.label("spare"))
+            .where(own)
+            .order_by(TicketTypeShard.shard)
+            .with_for_update()
+        ).all()
+        available = sum(r.spare for r in locked)
+        if available < quantity:
+            raise InsufficientInventory(ticket_type.id, ticket_type.name, quantity, available)
+        claimed, wanted = {}, quantity
+        for r in locked:
+            if wanted and r.spare > 0:
+                claimed[r.shard] = min(wanted, r.spare)
+                wanted -= claimed[r.shard]
+        db.session.execute(
+            update(TicketTypeShard)
+            .where(own, TicketTypeShard.shard.in_(list(claimed)))
+            .values(quantity_sold=TicketTypeShard.quantity_sold + case(
+                *[(TicketTypeShard.shard == shard, n) for shard, n in claimed.items()], else_=0,
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        remaining = available - quantity
+    if remaining <= 0:
+        # The shard ran dry: check the rest, and publish a sell-out on the
+        # ticket_types row right away rather than at the next roll-up
+        remaining = db.session.execute(select(func.coalesce(func.sum(spare), 0)).where(own)).scalar()
+        if remaining <= 0:
+            fold_shard_counters([ticket_type.id])
+    return ShardedReservation(ticket_type.id, ticket_type.name, ticket_type.price, remaining, claimed)
+
+
+def fold_shard_counters(ticket_type_ids=None):
+    """Roll sharded ticket types' shards up into their ``ticket_types`` row.
+
+    Sets ``quantity_held`` to what their holds hold and ``quantity_sold`` to
+    the rest of what the shards have handed out. Only rows whose counts
+    changed are written. Runs in the caller's transaction.
+    """
+    held = (
+        select(func.coalesce(func.sum(InventoryHold.quantity), 0))
+        .where(InventoryHold.ticket_type_id == TicketType.id)
+        .scalar_subquery()
+    )
+    claimed = (
+        select(func.coalesce(func.sum(TicketTypeShard.quantity_sold), 0))
+        .where(TicketTypeShard.ticket_type_id == TicketType.id)
+        .scalar_subquery()
+    )
+    stmt = update(TicketType).where(
+        TicketType.inventory_shards > 0,
+        or_(TicketType.quantity_held != held, TicketType.quantity_sold != claimed - held),
+    )
+    if ticket_type_ids is not None:
+        stmt = stmt.where(TicketType.id.in_(list(ticket_type_ids)))
+    result = db.session.execute(
+        stmt.values(quantity_sold=claimed - held, quantity_held=held)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def lock_inventory(ticket_type_id):
+    """Lock a ticket type's stock counters and count what is claimed.
+
+    Sharded types are counted from their shard rows (locked too), since the
+    ``ticket_types`` row is only a roll-up for them. The locks last until
+    the caller's transaction ends, so the count holds while it is acted on.
+
+    Returns:
+        tuple: ``(ticket_type, claimed)``, the freshly loaded ticket type
+        and how many of its tickets are sold or held.
+    """
+    ticket_type = (
+        db.session.query(TicketType)
+        .filter(TicketType.id == ticket_type_id)
+        .populate_existing()
+        .with_for_update()
+        .one()
+    )
+    if ticket_type.inventory_shards:
+        claimed = sum(db.session.execute(
+            select(TicketTypeShard.quantity_sold)
+            .where(TicketTypeShard.ticket_type_id == ticket_type.id)
+            .with_for_update()
+        ).scalars())
+    else:
+        claimed = ticket_type.quantity_sold + ticket_type.quantity_held
+    return ticket_type, claimed
+
+
+def shard_ticket_type(ticket_type_id, shards):
+    """Spread a ticket type's stock over ``shards`` counter rows, or move it
+    back onto the ``ticket_types`` row with ``shards=0``.
+
+    Also re-splits after ``quantity_total`` changed. Whatever has been sold
+    or held so far stays on shard 0 (existing holds point there), the spare
+    stock is divided evenly. Runs in the caller's transaction and locks the
+    ticket type and its shards meanwhile.
+
+    Raises:
+        QuantityBelowClaimed: If ``quantity_total`` is below what has been
+            sold or held.
+    """
+    ticket_type, claimed = lock_inventory(ticket_type_id)
+    if ticket_type.quantity_total < claimed:
+        raise QuantityBelowClaimed(ticket_type.id, ticket_type.quantity_total, claimed)
+    own = TicketTypeShard.ticket_type_id == ticket_type.id
+    held = db.session.execute(
+        select(func.coalesce(func.sum(InventoryHold.quantity), 0))
+        .where(InventoryHold.ticket_type_id == ticket_type.id)
+    ).scalar()
+
+    db.session.execute(delete(TicketTypeShard).where(own).execution_options(synchronize_session=False))
+    db.session.execute(
+        update(InventoryHold)
+        .where(InventoryHold.ticket_type_id == ticket_type.id)
+        .values(shard=0 if shards else None)
+        .execution_options(synchronize_session=False)
+    )
+    if shards:
+        each, extra = divmod(ticket_type.quantity_total - claimed, shards)
+        db.session.execute(insert(TicketTypeShard), [
+            {
+                "ticket_type_id": ticket_type.id,
+                "shard": shard,
+                "quantity_total": each + (shard < extra) + (claimed if shard == 0 else 0),
+                "quantity_sold": claimed if shard == 0 else 0,
+            }
+            for shard in range(shards)
+        ])
+    ticket_type.inventory_shards = shards
+    ticket_type.quantity_sold = claimed - held
+    ticket_type.quantity_held = held
+    db.session.flush()
+    db.session.expire(ticket_type, ["shards"])
+    return ticket_type
+
+
+def notify_sold_out(event_id, reserved):
+    """Signal ``ticket_types_changed`` once a committed reservation sold out
+    a ticket type.
+
+    Ordinary sales don't signal: invalidating listings and purging the CDN on
+    every order would defeat caching during an on-sale spike. Remaining
+    counts elsewhere lag by their cache lifetime (the availability snapshot
+    by a few seconds); what must not lag is an event flipping to sold out.
+    """
+    if any(row.remaining <= 0 for row in reserved.values()):
+        notify_ticket_types_changed(event_id)
+
+
+def hold_tickets(event_id, quantities, order_id, ttl):
+    """Hold ``quantities`` for an unpaid order for ``ttl`` seconds.
+
+    Claims the tickets like :func:`reserve_tickets` but into
+    ``quantity_held`` (or off the shards of a sharded ticket type), and
+    records one :class:`InventoryHold` per line so they can be confirmed on
+    payment or released once expired. Nothing is
+    locked beyond the caller's transaction, in particular not across the
+    payment provider round trip.
+    """
+    reserved = reserve_tickets(event_id, quantities, held=True)
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl)
+    rows = []
+    for ticket_type_id, n in quantities.items():
+        # Sharded lines get one hold per shard they were claimed from
+        shards = getattr(reserved[ticket_type_id], "shards", None) or {None: n}
+        rows.extend(
+            {
+                "id": uuid4(),
+                "order_id": order_id,
+                "ticket_type_id": ticket_type_id,
+                "shard": shard,
+                "quantity": quantity,
+                "expires_at": expires_at,
+                "created_at": now,
+            }
+            for shard, quantity in shards.items()
+        )
+    db.session.execute(insert(InventoryHold), rows)
+    return reserved
+
+
+def _take_holds(condition):
+    """Delete the holds matching ``condition`` and return what they held.
+
+    Deleting first decides ownership: whoever removes a hold row (payment
+    callback or sweeper) is the only one adjusting the counters for it.
+
+    Returns:
+        tuple: ({ticket_type_id: quantity} held on ticket_types rows,
+        {(ticket_type_id, shard): quantity} held on shards, set of order ids)
+    """
+    rows = db.session.execute(
+        delete(InventoryHold)
+        .where(condition)
+        .returning(
+            InventoryHold.order_id, InventoryHold.ticket_type_id,
+            InventoryHold.shard, InventoryHold.quantity,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    quantities, sharded, order_ids = {}, {}, set()
+    for order_id, ticket_type_id, shard, quantity in rows:
+        if shard is None:
+            quantities[ticket_type_id] = quantities.get(ticket_type_id, 0) + quantity
+        else:
+            sharded[ticket_type_id, shard] = sharded.get((ticket_type_id, shard), 0) + quantity
+        order_ids.add(order_id)
+    return quantities, sharded, order_ids
+
+
+def _unhold(quantities, sell=False):
+    """Move held quantities back to stock, or on to sold. Returns event ids."""
+    if not quantities:
+        return set()
+    n = _per_ticket_type(quantities)
+    values = {TicketType.quantity_held: TicketType.quantity_held - n, TicketType.updated_at: datetime.utcnow()}
+    if sell:
+        values[TicketType.quantity_sold] = TicketType.quantity_sold + n
+    rows = db.session.execute(
+        update(TicketType)
+        .where(TicketType.id.in_(list(quantities)))
+        .values(values)
+        .returning(TicketType.event_id)
+        .execution_options(synchronize_session=False)
+    )
+    return {event_id for (event_id,) in rows}
+
+
+def _unclaim_shards(sharded):
+    """Give held tickets back to the shards they came from. Returns event ids."""
+    if not sharded:
+        return set()
+    lines = [
+        (and_(TicketTypeShard.ticket_type_id == ticket_type_id, TicketTypeShard.shard == shard), n)
+        for (ticket_type_id, shard), n in sharded.items()
+    ]
+    db.session.execute(
+        update(TicketTypeShard)
+        .where(or_(*[line for line, _ in lines]))
+        .values(quantity_sold=TicketTypeShard.quantity_sold - case(*lines, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    ticket_type_ids = {ticket_type_id for ticket_type_id, _ in sharded}
+    return set(db.session.scalars(select(TicketType.event_id).where(TicketType.id.in_(ticket_type_ids))))
+
+
+def confirm_holds(order_id):
+    """Turn a paid order's holds into sales, in the caller's transaction.
+
+    Returns:
+        dict: The confirmed ``{ticket_type_id: quantity}``, empty when the
+        holds were already released (the order expired before payment).
+    """
+    quantities, sharded, _ = _take_holds(InventoryHold.order_id == order_id)
+    _unhold(quantities, sell=True)
+    # Shards already count held tickets as sold; the roll-up moves them
+    # from quantity_held to quantity_sold on the ticket_types row
+    for (ticket_type_id, _), n in sharded.items():
+        quantities[ticket_type_id] = quantities.get(ticket_type_id, 0) + n
+    return quantities
+
+
+def release_holds(order_id):
+    """Give a cancelled order's held tickets back, in the caller's transaction.
+
+    Returns:
+        set: Ids of the events whose availability went up.
+    """
+    quantities, sharded, _ = _take_holds(InventoryHold.order_id == order_id)
+    return _unhold(quantities) | _unclaim_shards(sharded)
+
+
+def release_expired_holds(now=None, batch_size=500):
+    """Release every hold past its ``expires_at``, ``batch_size`` at a time.
+
+    Each batch is a handful of set-based statements in its own short
+    transaction: delete the expired holds (RETURNING what they held), give
+    the quantities back with one ``CASE`` UPDATE, and expire the pending
+    orders left without holds. Concurrent sweepers skip rows another one
+    has locked (PostgreSQL ``SKIP LOCKED``).
+
+    Returns:
+        int: The number of holds released.
+    """
+    now = now or datetime.utcnow()
+    released = 0
+    while True:
+        expired = (
+            db.session.query(InventoryHold.id)
+            .filter(InventoryHold.expires_at <= now)
+            .order_by(InventoryHold.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .subquery()
+        )
+        quantities, sharded, order_ids = _take_holds(InventoryHold.id.in_(select(expired.c.id)))
+        if not order_ids:
+            db.session.commit()
+            return released
+        event_ids = _unhold(quantities) | _unclaim_shards(sharded)
+        db.session.execute(
+            update(Order)
+            .where(
+                Order.id.in_(list(order_ids)),
+                Order.status == "pending",
+                ~select(InventoryHold.id).where(InventoryHold.order_id == Order.id).exists(),
+            )
+            .values(status="expired")
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        released += sum(quantities.values()) + sum(sharded.values())
+        for event_id in event_ids:
+            notify_ticket_types_changed(event_id)
+
+
+class HoldSweeper:
+    """Background thread releasing expired holds (and rolling up sharded
+    counters) every ``HOLD_SWEEP_INTERVAL`` seconds.
+
+    The thread starts with the first request a worker serves, so CLI
+    commands (migrations included) never run it. Several workers sweeping
+    at once is safe: each hold is released by whoever deletes it.
+    """
+
+    def __init__(self):
+        self.interval = 30
+        self.batch_size = 500
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.interval = app.config.get("HOLD_SWEEP_INTERVAL", 30)
+        self.batch_size = app.config.get("HOLD_SWEEP_BATCH", 500)
+        if app.config.get("HOLD_SWEEPER_ENABLED", True):
+            self._app = app
+            app.before_request(self._ensure_started)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hold-sweeper", daemon=True)
+                self._thread.start()
+
+    def sweep(self):
+        try:
+            released = release_expired_holds(batch_size=self.batch_size)
+            fold_shard_counters()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self._app.logger.error(f"Releasing expired holds failed: {str(e)}")
+            return 0
+        if released:
+            self._app.logger.info(f"Released {released} expired held tickets")
+        return released
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._app.app_context():
+                self.sweep()
+
+
+hold_sweeper = HoldSweeper()
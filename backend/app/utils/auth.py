@@ -1,8 +1,13 @@
 from functools import wraps
 
 import bcrypt
-from flask import jsonify
-from flask_jwt_extended import get_jwt, verify_jwt_in_request
+import flask_jwt_extended
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt, get_jwt_header
+
+# WSGI environ key marking a batched sub-request whose forwarded token the
+# batch request already verified
+VERIFIED_JWT_ENVIRON_KEY = "eventgrid.verified_jwt"
 
 
 def hash_password(password: str) -> str:
@@ -17,6 +22,34 @@ def check_password(password: str, password_hash: str) -> bool:
         return False
 
 
+def verify_jwt_in_request(optional=False, **kwargs):
+    """``flask_jwt_extended.verify_jwt_in_request`` without the repeat check
+    in batched sub-requests.
+
+    ``POST /api/batch`` verifies the caller's access token once. Its
+    sub-requests share the batch's application context, so ``get_jwt()``
+    already returns that token and verifying the forwarded header again is
+    skipped. Checks asking for more than a plain access token (``fresh``,
+    ``refresh``, ...) always run.
+    """
+    if not kwargs and request.environ.get(VERIFIED_JWT_ENVIRON_KEY):
+        return get_jwt_header(), get_jwt()
+    return flask_jwt_extended.verify_jwt_in_request(optional=optional, **kwargs)
+
+
+def jwt_required(optional=False, **kwargs):
+    """``flask_jwt_extended.jwt_required`` on top of :func:`verify_jwt_in_request`."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **view_kwargs):
+            verify_jwt_in_request(optional=optional, **kwargs)
+            return current_app.ensure_sync(fn)(*args, **view_kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def role_required(allowed_roles):
     if isinstance(allowed_roles, str):
         allowed = {allowed_roles}
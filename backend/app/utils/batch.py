@@ -0,0 +1,59 @@
+from uuid import UUID
+
+from flask import current_app, request
+
+
+class InvalidIds(ValueError):
+    pass
+
+
+def get_requested_ids(arg="ids"):
+    """Parse a comma-separated ``?ids=`` list of UUIDs.
+
+    Duplicates are dropped, keeping the first occurrence, so the response
+    order matches the request order.
+
+    Returns:
+        list: The UUIDs in request order, or None when the argument is absent.
+
+    Raises:
+        InvalidIds: If an id is not a UUID or more than ``BATCH_IDS_MAX``
+            ids are requested.
+    """
+    raw = request.args.get(arg)
+    if raw is None:
+        return None
+    ids, seen, invalid = [], set(), []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = UUID(part)
+        except ValueError:
+            invalid.append(part)
+            continue
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+    if invalid:
+        raise InvalidIds(f"Invalid ids: {', '.join(invalid[:10])}")
+    limit = current_app.config.get("BATCH_IDS_MAX", 200)
+    if len(ids) > limit:
+        raise InvalidIds(f"At most {limit} ids can be requested at once")
+    return ids
+
+
+def fetch_by_ids(query, id_column, ids):
+    """Resolve ``ids`` with a single ``IN`` query.
+
+    Returns:
+        tuple: (rows, missing) with rows in the order of ``ids`` and missing
+        the ids (as strings) that matched nothing.
+    """
+    if not ids:
+        return [], []
+    found = {getattr(row, id_column.key): row for row in query.filter(id_column.in_(ids))}
+    rows = [found[i] for i in ids if i in found]
+    missing = [str(i) for i in ids if i not in found]
+    return rows, missing
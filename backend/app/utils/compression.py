@@ -0,0 +1,184 @@
+import re
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/calendar",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+}
+
+# Compressed representations get their own strong ETag ("<etag>-gzip");
+# this strips the suffix again from If-None-Match so validators still match
+_ETAG_SUFFIX_RE = re.compile(r'-(gzip|br)"')
+
+
+def no_compress(fn):
+    """Opt a view out of response compression (e.g. tiny, latency-bound JSON)."""
+    fn.no_compress = True
+    return fn
+
+
+def _gzip_compressor(level):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+# Streamed output is flushed to the client after this much input, trading a
+# little latency on tiny chunks for a usable compression ratio
+STREAM_FLUSH_BYTES = 8192
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._z = _gzip_compressor(level)
+        self._pending = 0
+
+    def compress(self, chunk):
+        data = self._z.compress(chunk)
+        self._pending += len(chunk)
+        if self._pending >= STREAM_FLUSH_BYTES:
+            self._pending = 0
+            data += self._z.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    def finish(self):
+        return self._z.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._c = brotli.Compressor(quality=quality)
+        self._pending = 0
+
+    def compress(self, chunk):
+        data = self._c.process(chunk)
+        self._pending += len(chunk)
+        if self._pending >= STREAM_FLUSH_BYTES:
+            self._pending = 0
+            data += self._c.flush()
+        return data
+
+    def finish(self):
+        return self._c.finish()
+
+
+class Compression:
+    """gzip/brotli response compression negotiated from ``Accept-Encoding``.
+
+    Buffered responses are compressed once they reach ``COMPRESS_MIN_SIZE``
+    bytes; streamed responses are compressed chunk by chunk. Responses
+    served from the response cache carry ``cached_variants`` so each
+    encoding of a cached body is compressed only once.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 500
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESS_ENABLED", True)
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 500)
+        self.gzip_level = app.config.get("COMPRESS_LEVEL", 6)
+        self.brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", 4)
+        if self.enabled:
+            app.before_request(self._strip_etag_suffixes)
+            app.after_request(self.compress_response)
+
+    def encodings(self):
+        return ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def _strip_etag_suffixes(self):
+        header = request.environ.get("HTTP_IF_NONE_MATCH")
+        match = _ETAG_SUFFIX_RE.search(header) if header else None
+        if match:
+            request.environ["HTTP_IF_NONE_MATCH"] = _ETAG_SUFFIX_RE.sub('"', header)
+            # Lets a 304 echo the ETag of the representation the client has
+            request.environ["eventgrid.etag_encoding"] = match.group(1)
+
+    def _compress(self, data, encoding):
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        z = _gzip_compressor(self.gzip_level)
+        return z.compress(data) + z.flush()
+
+    def _stream(self, chunks, encoding):
+        if encoding == "br":
+            compressor = _BrotliStream(self.brotli_quality)
+        else:
+            compressor = _GzipStream(self.gzip_level)
+        try:
+            for chunk in chunks:
+                data = compressor.compress(chunk) if chunk else b""
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def _skip(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206):
+            return True
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return True
+        if "Content-Encoding" in response.headers or response.direct_passthrough:
+            return True
+        view = current_app.view_functions.get(request.endpoint)
+        return bool(getattr(view, "no_compress", False))
+
+    def compress_response(self, response):
+        if response.status_code == 304:
+            encoding = request.environ.get("eventgrid.etag_encoding")
+            etag, weak = response.get_etag()
+            if encoding and etag:
+                response.set_etag(f"{etag}-{encoding}", weak=weak)
+            return response
+        if request.method == "HEAD" or self._skip(response):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        encoding = request.accept_encodings.best_match(self.encodings())
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            variants = getattr(response, "cached_variants", None)
+            body = variants.get(encoding) if variants is not None else None
+            if body is None:
+                body = self._compress(data, encoding)
+                if variants is not None:
+                    variants.set(encoding, body)
+            response.set_data(body)
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
+
+
+compression = Compression()
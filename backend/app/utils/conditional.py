@@ -0,0 +1,74 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from validator parts and the query string.
+
+    The sorted query arguments are always mixed in because the same
+    resource rendered with different arguments (page, filters, ...) is a
+    different representation. Empty values count too: ``?cursor=`` asks
+    for a keyset page, not the offset listing.
+    """
+    args = sorted(request.args.items(multi=True))
+    seed = "|".join(str(p) for p in parts) + "|" + repr(args)
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def conditional(validators):
+    """Answer conditional GETs before the view serializes anything.
+
+    Args:
+        validators: Callable receiving the view arguments and returning
+            ``(etag, last_modified)`` from a cheap query, or None when the
+            resource cannot be validated (the view then runs as usual,
+            e.g. to produce its 404).
+
+    A matching ``If-None-Match`` (or, without one, a satisfied
+    ``If-Modified-Since``) gets an empty 304. Otherwise the view runs and
+    its 200 responses carry ``ETag`` and ``Last-Modified``.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                validated = validators(**kwargs)
+            except Exception as e:
+                current_app.logger.error(f"Computing validators failed: {str(e)}")
+                validated = None
+            if validated is None:
+                return fn(*args, **kwargs)
+
+            etag, last_modified = validated
+            return respond_conditionally(etag, last_modified, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def respond_conditionally(etag, last_modified, make_rv):
+    """Answer a conditional GET from already computed validators.
+
+    For views whose validators fall out of the rows they fetch anyway:
+    ``make_rv`` (the view's return value, deferred) is only called when the
+    client's copy is stale, so a 304 skips serialization.
+    """
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return not_modified(etag, last_modified)
+
+    response = current_app.make_response(make_rv())
+    if response.status_code == 200:
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+    return response
@@ -0,0 +1,110 @@
+import json
+
+from flask import current_app, request
+from sqlalchemy import text
+
+from ..extensions import db
+from .cache import TTLCache
+from .invalidation import events_changed, ticket_types_changed
+
+COUNT_STRATEGIES = ("exact", "cached", "estimate")
+
+# One cache per table so a write only drops the counts it can affect
+_count_caches = {}
+
+
+def _cache_for(table_name):
+    cache = _count_caches.get(table_name)
+    if cache is None:
+        cache = _count_caches.setdefault(table_name, TTLCache(maxsize=1024))
+    return cache
+
+
+def invalidate_counts(table_name):
+    cache = _count_caches.get(table_name)
+    if cache is not None:
+        cache.clear()
+
+
+@events_changed.connect
+@ticket_types_changed.connect
+def _on_events_changed(sender, **extra):
+    invalidate_counts("events")
+
+
+def get_count_strategy(config_key):
+    """Pick the count strategy from ``?count=`` or the given config key."""
+    strategy = (request.args.get("count") or "").strip().lower()
+    if strategy not in COUNT_STRATEGIES:
+        strategy = current_app.config.get(config_key) or "exact"
+    return strategy if strategy in COUNT_STRATEGIES else "exact"
+
+
+def _exact_count(query):
+    return query.order_by(None).count()
+
+
+def _compile(query):
+    return query.order_by(None).statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def _cached_count(query, table_name):
+    compiled = _compile(query)
+    params = sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in compiled.params.items()
+    )
+    key = (str(compiled), tuple(params))
+    cache = _cache_for(table_name)
+    total = cache.get(key)
+    if total is None:
+        total = _exact_count(query)
+        cache.set(key, total, ttl=current_app.config.get("COUNT_CACHE_TTL", 60))
+    return total
+
+
+def _estimated_count(query, table_name, filtered):
+    """Return the Postgres planner's row estimate, or None if unavailable."""
+    if db.engine.dialect.name != "postgresql":
+        return None
+    if not filtered:
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+            {"t": table_name},
+        ).scalar()
+    else:
+        compiled = _compile(query)
+        plan = db.session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+    # reltuples is -1 (or 0) until the table has been analyzed
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+
+def count_query(query, table_name, strategy="exact", filtered=False):
+    """Count the rows ``query`` would return using the given strategy.
+
+    - ``exact``: a plain ``COUNT(*)``.
+    - ``cached``: an exact count memoised per compiled query for
+      ``COUNT_CACHE_TTL`` seconds and dropped whenever the table changes.
+    - ``estimate``: the Postgres planner estimate (``pg_class.reltuples``
+      for unfiltered listings, ``EXPLAIN`` otherwise). Falls back to an
+      exact count on other databases or before the table is analyzed.
+
+    Returns:
+        tuple: (total, strategy_used)
+    """
+    if strategy == "estimate":
+        estimate = _estimated_count(query, table_name, filtered)
+        if estimate is not None:
+            return estimate, "estimate"
+        strategy = "exact"
+    if strategy == "cached":
+        return _cached_count(query, table_name), "cached"
+    return _exact_count(query), "exact"
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from functools import wraps
+from importlib import import_module
+
+from flask import current_app
+
+from .invalidation import events_changed, ticket_types_changed
+
+
+class NullPurger:
+    """Purger used when no CDN sits in front of the API."""
+
+    def purge(self, keys):
+        pass
+
+
+class FilePurger:
+    """Appends purge requests to a JSON-lines file (local testing/auditing)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def purge(self, keys):
+        line = json.dumps({"keys": list(keys), "at": time.time()})
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+def load_purger(spec):
+    """Build a purger from ``EDGE_CACHE_PURGER``.
+
+    ``null`` (default), ``file:<path>``, or ``package.module:ClassName`` for a
+    CDN-specific implementation (constructed without arguments, exposing
+    ``purge(keys)``).
+    """
+    spec = (spec or "null").strip()
+    if spec == "null":
+        return NullPurger()
+    if spec.startswith("file:"):
+        return FilePurger(spec[len("file:"):])
+    module_name, _, attr = spec.partition(":")
+    return getattr(import_module(module_name), attr)()
+
+
+class EdgeCache:
+    """Cache-Control / Surrogate-Key headers for CDN-cacheable public reads,
+    and purges of those keys when the underlying data changes.
+
+    Browsers get a short ``max-age``; the CDN keeps responses for
+    ``s-maxage`` since writes purge the affected surrogate keys, and may
+    serve a stale copy for ``stale-while-revalidate`` seconds while it
+    refetches. Ticket sales only purge on a sell-out, so routes exposing
+    remaining counts pass short lifetimes instead.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.max_age = 30
+        self.s_maxage = 300
+        self.stale_while_revalidate = 60
+        self.purger = NullPurger()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("EDGE_CACHE_ENABLED", True)
+        self.max_age = app.config.get("EDGE_CACHE_MAX_AGE", 30)
+        self.s_maxage = app.config.get("EDGE_CACHE_S_MAXAGE", 300)
+        self.stale_while_revalidate = app.config.get("EDGE_CACHE_SWR", 60)
+        try:
+            self.purger = load_purger(app.config.get("EDGE_CACHE_PURGER"))
+        except Exception as e:
+            app.logger.error(f"Could not load edge cache purger, purges are disabled: {str(e)}")
+            self.purger = NullPurger()
+
+    def purge(self, *keys):
+        if not self.enabled:
+            return
+        try:
+            self.purger.purge(keys)
+        except Exception as e:
+            current_app.logger.error(f"Edge cache purge failed for {', '.join(keys)}: {str(e)}")
+
+    def public(self, tags, max_age=None, s_maxage=None, stale_while_revalidate=None):
+        """Mark a GET view's 200/304 responses as cacheable at the edge.
+
+        Args:
+            tags: Callable receiving the view arguments and returning the
+                surrogate keys of the response, or None when the response is
+                personalised (it is then marked private).
+            max_age, s_maxage, stale_while_revalidate: Per-route overrides
+                of the configured lifetimes, in seconds.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                response = current_app.make_response(fn(*args, **kwargs))
+                if not self.enabled or response.status_code not in (200, 304):
+                    return response
+                keys = tags(**kwargs)
+                if keys is None:
+                    response.headers["Cache-Control"] = "private, no-cache"
+                    return response
+                browser = self.max_age if max_age is None else max_age
+                edge = self.s_maxage if s_maxage is None else s_maxage
+                stale = self.stale_while_revalidate if stale_while_revalidate is None else stale_while_revalidate
+                response.headers["Cache-Control"] = (
+                    f"public, max-age={browser}, s-maxage={edge}, stale-while-revalidate={stale}"
+                )
+                response.headers["Surrogate-Key"] = " ".join(keys)
+                return response
+            return wrapper
+        return decorator
+
+
+edge_cache = EdgeCache()
+
+
+@events_changed.connect
+def _on_events_changed(sender, event_id=None, **extra):
+    keys = ["events:list"]
+    if event_id is not None:
+        keys.append(f"event:{event_id}")
+    edge_cache.purge(*keys)
+
+
+@ticket_types_changed.connect
+def _on_ticket_types_changed(sender, event_id=None, **extra):
+    edge_cache.purge("events:list", f"event:{event_id}")
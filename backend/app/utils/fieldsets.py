@@ -0,0 +1,66 @@
+from functools import lru_cache
+
+from flask import request
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+
+from ..schemas.fast import compile_schema
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def get_requested_fields(schema_cls):
+    """Parse ``?fields=a,b,c`` against the fields ``schema_cls`` can dump.
+
+    Returns:
+        frozenset: The requested field names, or None when the argument is
+        absent and the full representation should be returned.
+
+    Raises:
+        InvalidFields: If a name is not a field of the schema.
+    """
+    raw = request.args.get("fields")
+    if raw is None or not raw.strip():
+        return None
+    names = frozenset(part.strip() for part in raw.split(",") if part.strip())
+    unknown = names - set(schema_cls._declared_fields)
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return names
+
+
+@lru_cache(maxsize=256)
+def schema_variant(schema_cls, only=None, many=False):
+    """Return a shared, compiled ``schema_cls(only=..., many=...)``.
+
+    Building a marshmallow schema copies and binds every declared field, so
+    each distinct field set is built and compiled once and reused across
+    requests.
+    """
+    return compile_schema(schema_cls(only=only, many=many))
+
+
+def column_options(model, only, always=("id",), depends=None):
+    """Loader options restricting ``model``'s SELECT to the needed columns.
+
+    Args:
+        model: The mapped class being queried.
+        only: Requested field names, or None to load everything.
+        always: Columns that must be loaded regardless (primary key,
+            ordering or cursor columns, ...).
+        depends: Optional mapping from a serialized field that is not a
+            column (hybrid or method fields) to the columns it reads.
+
+    Returns:
+        list: ``[load_only(...)]``, or an empty list when ``only`` is None.
+    """
+    if only is None:
+        return []
+    column_keys = sa_inspect(model).column_attrs.keys()
+    wanted = set(always)
+    for name in only:
+        wanted.update((depends or {}).get(name, (name,)))
+    attrs = [getattr(model, key) for key in column_keys if key in wanted]
+    return [load_only(*attrs)]
@@ -0,0 +1,253 @@
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from uuid import UUID
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.idempotency import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Duplicates arriving at the worker running the original wait on its event
+# instead of polling the table
+_running = {}
+_running_lock = threading.Lock()
+
+
+def _request_hash():
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode("utf-8"))
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _lookup(user_id, key):
+    row = db.session.execute(
+        select(
+            IdempotencyKey.request_hash, IdempotencyKey.status_code,
+            IdempotencyKey.response_body, IdempotencyKey.locked_at,
+            IdempotencyKey.expires_at,
+        ).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    ).first()
+    # End the read so the next look sees rows committed meanwhile
+    db.session.rollback()
+    return row
+
+
+def _lease():
+    return timedelta(seconds=current_app.config.get("IDEMPOTENCY_LEASE_SECONDS", 120))
+
+
+def _abandoned(row, now=None):
+    """Whether an in-progress row outlived its lease (its worker died)."""
+    return row.status_code is None and row.locked_at <= (now or datetime.utcnow()) - _lease()
+
+
+def _claim(user_id, key, request_hash):
+    """Insert the in-progress row for ``key``, or take over an abandoned one.
+
+    Returns:
+        tuple: ``(locked_at, None)`` when this request owns the key and
+        should run, ``(None, row)`` with the existing (unexpired) row when
+        another request got there first.
+    """
+    ttl = timedelta(seconds=current_app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400))
+    while True:
+        now = datetime.utcnow()
+        try:
+            db.session.execute(insert(IdempotencyKey).values(
+                user_id=user_id, key=key, request_hash=request_hash,
+                created_at=now, locked_at=now, expires_at=now + ttl,
+            ))
+            db.session.commit()
+            if random.random() < current_app.config.get("IDEMPOTENCY_PURGE_RATE", 0.01):
+                purge_expired_keys(batch_size=current_app.config.get("IDEMPOTENCY_PURGE_BATCH", 500), once=True)
+            return now, None
+        except IntegrityError:
+            db.session.rollback()
+        row = _lookup(user_id, key)
+        if row is not None and row.expires_at > now:
+            if row.request_hash != request_hash or not _abandoned(row, now):
+                return None, row
+            # The worker running it died mid-request: take the lease over.
+            # Matching on the old locked_at lets one taker win.
+            taken = db.session.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None),
+                    IdempotencyKey.locked_at == row.locked_at,
+                )
+                .values(locked_at=now)
+            ).rowcount
+            db.session.commit()
+            if taken:
+                return now, None
+            continue
+        if row is not None:
+            # Expired but not purged yet: clear it and claim again
+            db.session.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                IdempotencyKey.expires_at <= now,
+            ))
+            db.session.commit()
+
+
+def _wait(user_id, key):
+    """Wait up to ``IDEMPOTENCY_WAIT_SECONDS`` for the request holding
+    ``key`` to finish, and return its row (None if it failed and let go).
+    Returns early when the holder's lease lapses."""
+    deadline = time.monotonic() + current_app.config.get("IDEMPOTENCY_WAIT_SECONDS", 10)
+    delay = 0.05
+    while True:
+        with _running_lock:
+            running = _running.get((user_id, key))
+        if running is not None:
+            running.wait(max(0, deadline - time.monotonic()))
+        row = _lookup(user_id, key)
+        if row is None or row.status_code is not None or _abandoned(row) or time.monotonic() >= deadline:
+            return row
+        time.sleep(min(delay, max(0, deadline - time.monotonic())))
+        delay = min(delay * 2, 0.5)
+
+
+def _run(fn, args, kwargs, user_id, key, locked_at):
+    done = threading.Event()
+    with _running_lock:
+        _running[(user_id, key)] = done
+    try:
+        response = current_app.make_response(fn(*args, **kwargs))
+    except Exception:
+        db.session.rollback()
+        _release(user_id, key, locked_at)
+        raise
+    finally:
+        with _running_lock:
+            _running.pop((user_id, key), None)
+
+    try:
+        if response.status_code >= 500:
+            # Let the client retry a failure with the same key
+            _release(user_id, key, locked_at)
+        else:
+            db.session.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                    IdempotencyKey.locked_at == locked_at,
+                )
+                .values(status_code=response.status_code, response_body=response.get_data(as_text=True))
+            )
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Storing idempotent response failed: {str(e)}")
+        # Don't leave retries waiting on a row nobody will finish; if even
+        # this fails, the lease lets the next retry take over
+        try:
+            _release(user_id, key, locked_at)
+        except Exception:
+            db.session.rollback()
+    finally:
+        done.set()
+    return response
+
+
+def _release(user_id, key, locked_at):
+    db.session.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+        IdempotencyKey.status_code.is_(None),
+        IdempotencyKey.locked_at == locked_at,
+    ))
+    db.session.commit()
+
+
+def _replay(row):
+    response = current_app.response_class(row.response_body, status=row.status_code, mimetype="application/json")
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(fn):
+    """Run a POST view at most once per ``Idempotency-Key`` header and user.
+
+    The first request with a key runs the view and stores its response;
+    retries with the same key and body get that response back without the
+    view running again. A duplicate arriving while the first is still
+    running waits for it (up to ``IDEMPOTENCY_WAIT_SECONDS``) and then
+    replays its response, so concurrent retries are coalesced into one
+    execution. 5xx responses are not stored, so they can be retried.
+    A request still unfinished after ``IDEMPOTENCY_LEASE_SECONDS`` is
+    taken to be dead (worker killed) and the next retry runs instead.
+
+    Requests without the header are unaffected. Apply below
+    ``jwt_required``; keys are scoped to the caller's identity.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return fn(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"message": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters"}), 400
+        try:
+            user_id = UUID(str(get_jwt_identity()))
+        except ValueError:
+            return jsonify({"message": "Invalid token"}), 400
+
+        request_hash = _request_hash()
+        while True:
+            locked_at, row = _claim(user_id, key, request_hash)
+            if locked_at is not None:
+                return _run(fn, args, kwargs, user_id, key, locked_at)
+            if row.request_hash != request_hash:
+                return jsonify({
+                    "message": f"{HEADER} was already used for a different request"
+                }), 422
+            if row.status_code is None:
+                row = _wait(user_id, key)
+                if row is None or _abandoned(row):
+                    # The original failed and let go of the key, or died
+                    # holding it: run it here
+                    continue
+                if row.status_code is None:
+                    response = jsonify({"message": "A request with this Idempotency-Key is still in progress"})
+                    response.status_code = 409
+                    response.headers["Retry-After"] = "1"
+                    return response
+            return _replay(row)
+
+    return wrapper
+
+
+def purge_expired_keys(now=None, batch_size=500, once=False):
+    """Delete expired idempotency keys, ``batch_size`` per transaction.
+
+    Returns:
+        int: The number of keys deleted.
+    """
+    now = now or datetime.utcnow()
+    purged = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= now)
+            .limit(batch_size)
+            .subquery()
+        )
+        result = db.session.execute(delete(IdempotencyKey).where(
+            tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(select(expired.c.user_id, expired.c.key))
+        ))
+        db.session.commit()
+        purged += result.rowcount
+        if once or result.rowcount < batch_size:
+            return purged
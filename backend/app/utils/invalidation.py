@@ -0,0 +1,22 @@
+from blinker import Namespace
+from flask import current_app
+
+_signals = Namespace()
+
+# Sent after a committed create/update/delete of an event. Receivers get the
+# app as sender and the affected ``event_id`` keyword argument.
+events_changed = _signals.signal("events-changed")
+
+
+def notify_events_changed(event_id=None):
+    """Tell caches and indexes that event data changed after a commit."""
+    events_changed.send(current_app._get_current_object(), event_id=event_id)
+
+# Sent after a committed create/update/delete of a ticket type, with the
+# owning ``event_id``.
+ticket_types_changed = _signals.signal("ticket-types-changed")
+
+
+def notify_ticket_types_changed(event_id):
+    """Tell caches and indexes that an event's ticket types changed."""
+    ticket_types_changed.send(current_app._get_current_object(), event_id=event_id)
@@ -0,0 +1,74 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency, the stdlib provider is used without it
+    orjson = None
+
+JSON_PROVIDERS = ("auto", "orjson", "default")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider encoding responses with orjson.
+
+    UUIDs, dicts, lists and scalars are encoded natively. Everything else,
+    datetimes included, still goes through Flask's ``default`` so the output
+    matches :class:`~flask.json.provider.DefaultJSONProvider` (datetimes stay
+    HTTP dates). Calls orjson cannot reproduce exactly (extra ``json.dumps``
+    arguments, non-ASCII output while ``ensure_ascii`` is set, integers
+    beyond 64 bits) fall back to the stdlib encoder. The one remaining
+    difference is float exponents (``1e16`` rather than ``1e+16``); NaN and
+    infinities become ``null``.
+    """
+
+    def _orjson_options(self, indent=False):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _dumpb(self, obj, indent=False):
+        """Encode ``obj`` to bytes, or return None if orjson can't match the stdlib."""
+        try:
+            data = orjson.dumps(obj, default=self.default, option=self._orjson_options(indent))
+        except orjson.JSONEncodeError:
+            return None
+        if self.ensure_ascii and not data.isascii():
+            return None
+        return data
+
+    def dumps(self, obj, **kwargs):
+        # orjson only writes the compact form
+        if kwargs == {"separators": (",", ":")}:
+            data = self._dumpb(obj)
+            if data is not None:
+                return data.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        data = self._dumpb(obj, indent=indent)
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Install the JSON provider selected by ``JSON_PROVIDER``.
+
+    ``auto`` uses orjson when it is installed, ``orjson`` asks for it
+    explicitly (with a warning if it is missing) and ``default`` keeps
+    Flask's stdlib provider.
+    """
+    choice = (app.config.get("JSON_PROVIDER") or "auto").lower()
+    if choice not in JSON_PROVIDERS:
+        app.logger.warning(f"Unknown JSON_PROVIDER {choice!r}; using the default provider")
+        choice = "default"
+    if choice == "orjson" and orjson is None:
+        app.logger.warning("JSON_PROVIDER is orjson but orjson is not installed; using the default provider")
+    if choice != "default" and orjson is not None:
+        app.json = OrjsonProvider(app)
+    return app.json
@@ -1,7 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
 from flask import request
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, row_id, direction="next"):
+    """Encode a keyset position as an opaque, URL-safe cursor string."""
+    payload = [sort_value.isoformat(), str(row_id), direction]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Returns:
+        tuple: (sort_value, row_id, direction)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or tampered with.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(sort_value), UUID(row_id), direction
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def get_pagination_params(allow_cursor=False):
+    """Read pagination parameters from the query string.
 
+    Legacy offset mode uses ``page``/``per_page``. When ``allow_cursor`` is
+    set, a ``cursor`` argument switches to keyset mode: an empty value asks
+    for the first page, anything else must be a cursor from a previous
+    response's ``meta``.
 
-def get_pagination_params():
+    Returns:
+        tuple: (page, per_page), or (page, per_page, cursor) when
+        ``allow_cursor`` is set. In cursor mode page is None and cursor is
+        either "" (first page) or the decoded (sort_value, id, direction)
+        tuple; in offset mode cursor is None.
+
+    Raises:
+        InvalidCursor: If a non-empty cursor cannot be decoded.
+    """
     try:
         page = int(request.args.get("page", 1))
     except ValueError:
@@ -12,4 +64,68 @@ def get_pagination_params():
         per_page = 10
     per_page = max(1, min(per_page, 100))
     page = max(1, page)
-    return page, per_page
+    if not allow_cursor:
+        return page, per_page
+
+    if "cursor" not in request.args:
+        return page, per_page, None
+    raw = request.args.get("cursor", "").strip()
+    return None, per_page, (decode_cursor(raw) if raw else "")
+
+
+def keyset_paginate(query, sort_column, id_column, cursor, per_page):
+    """Fetch one page of ``query`` ordered by (sort_column, id_column) desc.
+
+    No OFFSET and no COUNT(*) are issued: the page starts right after (or,
+    for "prev", right before) the position held in ``cursor``, and one
+    extra row is fetched to know whether another page exists.
+
+    Returns:
+        tuple: (items, meta) where meta carries next_cursor/prev_cursor.
+    """
+    direction = "next"
+    if cursor:
+        sort_value, row_id, direction = cursor
+        if direction == "next":
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id),
+            ))
+
+    if direction == "next":
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+
+    sort_attr, id_attr = sort_column.key, id_column.key
+
+    def _cursor_for(row, to):
+        return encode_cursor(getattr(row, sort_attr), getattr(row, id_attr), to)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if direction == "next":
+            more_after, more_before = has_more, bool(cursor)
+        else:
+            more_after, more_before = True, has_more
+        if more_after:
+            next_cursor = _cursor_for(rows[-1], "next")
+        if more_before:
+            prev_cursor = _cursor_for(rows[0], "prev")
+
+    return rows, {
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
@@ -0,0 +1,224 @@
+import hashlib
+import threading
+from functools import wraps
+
+from flask import current_app, request
+
+from .cache import TTLCache
+from .invalidation import events_changed, ticket_types_changed
+
+try:
+    import redis
+except ImportError:  # optional dependency, only needed for a shared backend
+    redis = None
+
+
+# Validator headers stored with a body so hits can answer conditional GETs
+STORED_HEADERS = ("ETag", "Last-Modified")
+
+
+class CachedResponse:
+    """A cached JSON response body, its validator headers and any compressed
+    copies of the body made while serving it (keyed by content coding)."""
+
+    __slots__ = ("body", "headers", "variants")
+
+    def __init__(self, body, headers=None, variants=None):
+        self.body = body
+        self.headers = headers or {}
+        self.variants = variants or {}
+
+
+class CachedVariants:
+    """Handle attached to responses as ``cached_variants`` so compression can
+    reuse (and store) precompressed bodies of a cache entry."""
+
+    __slots__ = ("backend", "key", "entry")
+
+    def __init__(self, backend, key, entry):
+        self.backend = backend
+        self.key = key
+        self.entry = entry
+
+    def get(self, encoding):
+        return self.entry.variants.get(encoding)
+
+    def set(self, encoding, body):
+        self.entry.variants[encoding] = body
+        try:
+            self.backend.set_variant(self.key, encoding, body)
+        except Exception as e:
+            current_app.logger.error(f"Response cache variant write failed: {str(e)}")
+
+
+class LocalBackend:
+    """In-process bounded LRU. Tag versions live outside the LRU so they are
+    never evicted (an evicted version would resurrect stale entries)."""
+
+    def __init__(self, maxsize=2048):
+        self._entries = TTLCache(maxsize=maxsize)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, entry, ttl):
+        self._entries.set(key, entry, ttl=ttl)
+
+    def set_variant(self, key, encoding, body):
+        # Entries are shared in-process objects, already updated in place
+        pass
+
+    def version(self, tag):
+        return self._versions.get(tag, 0)
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RedisBackend:
+    """Shared backend so every worker sees the same entries and versions."""
+
+    def __init__(self, url, prefix="eventgrid:rc:"):
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key):
+        fields = self._client.hgetall(self._prefix + key)
+        if not fields or b"body" not in fields:
+            return None
+        body = fields.pop(b"body")
+        variants = {
+            k[len(b"body:"):].decode("utf-8"): fields.pop(k)
+            for k in list(fields) if k.startswith(b"body:")
+        }
+        headers = {k.decode("utf-8"): v.decode("utf-8") for k, v in fields.items()}
+        return CachedResponse(body, headers, variants)
+
+    def set(self, key, entry, ttl):
+        name = self._prefix + key
+        pipe = self._client.pipeline()
+        pipe.hset(name, mapping={"body": entry.body, **entry.headers})
+        if ttl:
+            pipe.expire(name, ttl)
+        pipe.execute()
+
+    def set_variant(self, key, encoding, body):
+        name = self._prefix + key
+        # Only extend live entries: hset on an expired key would recreate it
+        # without a TTL
+        if self._client.exists(name):
+            self._client.hset(name, f"body:{encoding}", body)
+
+    def version(self, tag):
+        return int(self._client.get(self._prefix + "v:" + tag) or 0)
+
+    def bump(self, tag):
+        self._client.incr(self._prefix + "v:" + tag)
+
+    def clear(self):
+        for key in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(key)
+
+
+class ResponseCache:
+    """Cache of public JSON GET responses with tag-based invalidation.
+
+    Each entry's key embeds the current version of every tag it depends on
+    (e.g. ``events:list`` or ``event:<id>``), so invalidating a tag is a
+    single version bump and stale entries simply age out of the LRU.
+    """
+
+    def __init__(self):
+        self.backend = LocalBackend()
+        self.enabled = True
+        self.ttl = 300
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RESPONSE_CACHE_ENABLED", True)
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL", 300)
+        url = app.config.get("RESPONSE_CACHE_URL")
+        if url and redis is None:
+            app.logger.warning("RESPONSE_CACHE_URL is set but redis is not installed; using the local cache")
+            url = None
+        if url:
+            self.backend = RedisBackend(url)
+        else:
+            self.backend = LocalBackend(app.config.get("RESPONSE_CACHE_MAXSIZE", 2048))
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            try:
+                self.backend.bump(tag)
+            except Exception as e:
+                current_app.logger.error(f"Response cache invalidation failed for {tag}: {str(e)}")
+
+    def make_key(self, namespace, tags):
+        # Empty values are significant: ``?cursor=`` asks for the keyset first page
+        args = sorted(request.args.items(multi=True))
+        digest = hashlib.sha1(repr(args).encode("utf-8")).hexdigest()
+        versions = ".".join(str(self.backend.version(tag)) for tag in tags)
+        return f"{namespace}:{versions}:{digest}"
+
+    def cached(self, namespace, tags):
+        """Cache a view's 200 JSON responses.
+
+        Args:
+            namespace: Key prefix for the view.
+            tags: Callable receiving the view arguments and returning the
+                tags the response depends on, or None to bypass the cache
+                (e.g. for per-user variants).
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                entry_tags = tags(**kwargs) if self.enabled else None
+                if entry_tags is None:
+                    return fn(*args, **kwargs)
+
+                try:
+                    key = self.make_key(namespace, entry_tags)
+                    entry = self.backend.get(key)
+                except Exception as e:
+                    current_app.logger.error(f"Response cache read failed: {str(e)}")
+                    return fn(*args, **kwargs)
+
+                if entry is not None:
+                    response = current_app.response_class(entry.body, mimetype="application/json")
+                    response.headers.update(entry.headers)
+                    response.headers["X-Cache"] = "HIT"
+                    response.cached_variants = CachedVariants(self.backend, key, entry)
+                    return response.make_conditional(request)
+
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code == 200 and response.mimetype == "application/json":
+                    headers = {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+                    entry = CachedResponse(response.get_data(), headers)
+                    try:
+                        self.backend.set(key, entry, self.ttl)
+                        response.cached_variants = CachedVariants(self.backend, key, entry)
+                    except Exception as e:
+                        current_app.logger.error(f"Response cache write failed: {str(e)}")
+                    response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache()
+
+
+@events_changed.connect
+def _on_events_changed(sender, event_id=None, **extra):
+    response_cache.invalidate("events:list", f"event:{event_id}")
+
+
+@ticket_types_changed.connect
+def _on_ticket_types_changed(sender, event_id=None, **extra):
+    # The listing's ``available`` filter depends on ticket inventory too
+    response_cache.invalidate("events:list", f"event:{event_id}")
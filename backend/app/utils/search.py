@@ -0,0 +1,144 @@
+import re
+
+from flask import current_app
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+
+from ..extensions import db
+from ..models.event import Event
+
+# Columns covered by the event search index, with their ranking weight
+# (Postgres setweight labels, as in migration b4e1c7d2a9f3 / SQLite bm25
+# column weights).
+SEARCH_COLUMNS = (
+    ("title", "A", 10.0),
+    ("category", "B", 5.0),
+    ("venue_name", "B", 5.0),
+    ("address", "C", 2.0),
+    ("description", "D", 1.0),
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_events_fts = table("events_fts", column("event_id"))
+
+
+def _install_postgres(conn):
+    # The generated column and its GIN index come from migration
+    # b4e1c7d2a9f3; DDL on events is too heavy to repeat on every boot
+    installed = conn.execute(text(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = current_schema() "
+        "AND table_name = 'events' AND column_name = 'search_vector'"
+    )).first()
+    if installed is None:
+        raise RuntimeError("events.search_vector is missing; run the database migrations")
+
+
+def _install_sqlite(conn):
+    names = [name for name, _, _ in SEARCH_COLUMNS]
+    cols = ", ".join(names)
+    new_vals = ", ".join(f"new.{name}" for name in names)
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+    )).first()
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+        f"event_id UNINDEXED, {cols}, tokenize = 'porter unicode61')"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+        f"INSERT INTO events_fts (event_id, {cols}) VALUES (new.id, {new_vals}); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+        "DELETE FROM events_fts WHERE event_id = old.id; END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE ON events BEGIN "
+        "DELETE FROM events_fts WHERE event_id = old.id; "
+        f"INSERT INTO events_fts (event_id, {cols}) VALUES (new.id, {new_vals}); END"
+    ))
+
+    if not exists:
+        # Backfill rows that were written before the shadow table existed
+        conn.execute(text(
+            f"INSERT INTO events_fts (event_id, {cols}) SELECT id, {cols} FROM events"
+        ))
+
+
+def install_event_search(engine):
+    """Set up full-text search for the events table.
+
+    On Postgres this only checks that the generated ``tsvector`` column
+    (and GIN index) from the migrations is present. SQLite gets an FTS5
+    shadow table kept in sync by triggers; every statement is idempotent
+    so this is safe to run on each startup.
+
+    Raises:
+        RuntimeError: If the Postgres search column has not been migrated.
+
+    Returns:
+        str: The dialect name of the installed backend, or None when the
+        database has no supported full-text engine.
+    """
+    dialect = engine.dialect.name
+    installers = {"postgresql": _install_postgres, "sqlite": _install_sqlite}
+    installer = installers.get(dialect)
+    if installer is None:
+        return None
+    with engine.begin() as conn:
+        installer(conn)
+    return dialect
+
+
+def _ilike_filter(query, q):
+    like = f"%{q}%"
+    return query.filter(
+        or_(
+            Event.title.ilike(like),
+            Event.description.ilike(like),
+            Event.category.ilike(like),
+            Event.venue_name.ilike(like),
+            Event.address.ilike(like),
+        )
+    )
+
+
+def apply_event_search(query, q):
+    """Filter an ``Event`` query by a free-text search string.
+
+    Uses the full-text index installed by :func:`install_event_search` and
+    falls back to ``ilike`` matching when it is unavailable, or when every
+    term is a Postgres stop word. Every search term must match (as a
+    prefix, so partially typed words still hit).
+
+    Returns:
+        tuple: (query, relevance_order) where relevance_order is an ORDER BY
+        clause putting the best matches first, or None for the fallback.
+    """
+    backend = current_app.extensions.get("event_search")
+    tokens = _TOKEN_RE.findall(q.lower())
+    if not backend or not tokens:
+        return _ilike_filter(query, q), None
+
+    if backend == "postgresql":
+        vector = literal_column("events.search_vector")
+        tsquery = func.to_tsquery(
+            literal_column("'english'::regconfig"),
+            " & ".join(f"{token}:*" for token in tokens),
+        )
+        if not db.session.execute(select(func.numnode(tsquery))).scalar():
+            # Only stop words ("the", "and"): the tsquery is empty and
+            # would match nothing
+            return _ilike_filter(query, q), None
+        query = query.filter(vector.op("@@")(tsquery))
+        return query, func.ts_rank_cd(vector, tsquery).desc()
+
+    fts = literal_column("events_fts")
+    match = " ".join(f'"{token}"*' for token in tokens)
+    query = query.join(_events_fts, _events_fts.c.event_id == Event.id).filter(
+        fts.op("MATCH")(match)
+    )
+    # bm25() is lower-is-better; the leading 0.0 weights the unindexed event_id
+    weights = [literal_column(repr(w)) for _, _, w in SEARCH_COLUMNS]
+    return query, func.bm25(fts, literal_column("0.0"), *weights).asc()
@@ -0,0 +1,75 @@
+from flask import Response, current_app, request, stream_with_context
+
+from ..extensions import db
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Rows fetched, serialized and released from the session per round trip
+STREAM_BATCH_SIZE = 500
+
+
+def get_stream_mode():
+    """Pick a streaming format for a list endpoint, if the client asked for one.
+
+    ``Accept: application/x-ndjson`` selects NDJSON (one object per line);
+    ``?stream=true`` keeps the usual JSON envelope but sends it as a
+    chunked array.
+
+    Returns:
+        str: "ndjson", "json", or None for a regular buffered response.
+    """
+    accept = request.accept_mimetypes
+    if accept.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return "ndjson"
+    if (request.args.get("stream") or "").lower() in ("1", "true", "yes"):
+        return "json"
+    return None
+
+
+def stream_query(query, schema, key, mode, batch_size=STREAM_BATCH_SIZE):
+    """Stream the rows of an ORM ``query`` serialized one at a time.
+
+    Rows are fetched ``batch_size`` at a time (``yield_per``) and each batch
+    is dropped from the session once written, so memory stays flat however
+    many rows the query returns. Collections must be loaded with
+    ``selectinload``; joined collection loading cannot be combined with
+    ``yield_per``.
+
+    Args:
+        query: The ordered query to stream.
+        schema: A (compiled) schema used to dump each row.
+        key: Envelope key for the chunked JSON array mode (``{key: [...]}``).
+        mode: "ndjson" or "json", as returned by :func:`get_stream_mode`.
+
+    Returns:
+        Response: A streamed response.
+    """
+    dumps = current_app.json.dumps
+    statement = query.statement.execution_options(yield_per=batch_size)
+
+    def generate():
+        first = True
+        if mode == "json":
+            yield '{"%s":[' % key
+        try:
+            result = db.session.execute(statement).scalars()
+            for batch in result.partitions():
+                encoded = [dumps(schema.dump(row, many=False), separators=(",", ":")) for row in batch]
+                # expunge (not expunge_all) keeps the identity map the open
+                # result is still loading into
+                for row in batch:
+                    db.session.expunge(row)
+                if mode == "ndjson":
+                    yield "\n".join(encoded) + "\n"
+                else:
+                    yield ("" if first else ",") + ",".join(encoded)
+                first = False
+        except Exception as e:
+            # Headers are gone already; a truncated body is the only signal
+            current_app.logger.exception(f"Streaming {key} failed: {str(e)}")
+            return
+        if mode == "json":
+            yield "]}\n"
+
+    mimetype = NDJSON_MIMETYPE if mode == "ndjson" else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
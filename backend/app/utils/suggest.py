@@ -0,0 +1,150 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from uuid import UUID
+
+from ..extensions import db
+from ..models.event import Event
+from .invalidation import events_changed
+
+# Suggestion kinds, in the order they are ranked for equally good matches
+SUGGEST_KINDS = ("title", "venue", "category")
+
+_COLUMNS = (
+    ("title", Event.title),
+    ("venue", Event.venue_name),
+    ("category", Event.category),
+)
+
+# Upper bound on prefix matches examined per lookup, so one-letter
+# prefixes stay cheap on large catalogues
+_MAX_CANDIDATES = 500
+
+
+def _prefix_keys(value):
+    """Lower-cased keys under which ``value`` can be found.
+
+    The whole value plus every later word start, so "Jazz Night Nairobi"
+    is suggested for "jazz", "night" and "nai".
+    """
+    words = value.lower().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class SuggestIndex:
+    """In-process prefix index over published events' titles, venues and
+    categories.
+
+    Entries are ``(key, kind, value, event_id)`` tuples kept in one sorted
+    list, so a lookup is a bisect to the first key starting with the prefix
+    followed by a short forward scan. The index is built on first use and
+    then patched one event at a time as ``events_changed`` reports writes.
+    Those signals only reach the worker that made the write, so the whole
+    index is also rebuilt every ``reload_seconds`` to pick up other
+    workers' writes.
+    """
+
+    def __init__(self, reload_seconds=300):
+        self.reload_seconds = reload_seconds
+        self._entries = []
+        self._by_event = {}
+        self._pending = set()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.reload_seconds = app.config.get("SUGGEST_RELOAD_SECONDS", 300)
+
+    def invalidate(self, event_id=None):
+        """Queue ``event_id`` for a refresh, or the whole index when None."""
+        with self._lock:
+            if event_id is None:
+                self._loaded_at = None
+            else:
+                self._pending.add(str(event_id))
+
+    def _add(self, row, keep_sorted=True):
+        event_id = str(row.id)
+        keys = []
+        for kind, column in _COLUMNS:
+            value = (getattr(row, column.key) or "").strip()
+            if not value:
+                continue
+            for key in _prefix_keys(value):
+                entry = (key, kind, value, event_id)
+                if keep_sorted:
+                    insort(self._entries, entry)
+                else:
+                    self._entries.append(entry)
+                keys.append(entry)
+        self._by_event[event_id] = keys
+
+    def _remove(self, event_id):
+        for entry in self._by_event.pop(event_id, ()):
+            i = bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+
+    def _query(self):
+        return db.session.query(Event.id, *(column for _, column in _COLUMNS)).filter(
+            Event.is_published.is_(True)
+        )
+
+    def _sync(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_seconds:
+            self._entries, self._by_event, self._pending = [], {}, set()
+            for row in self._query().yield_per(1000):
+                self._add(row, keep_sorted=False)
+            self._entries.sort()
+            self._loaded_at = time.monotonic()
+            return
+        if self._pending:
+            ids = list(self._pending)
+            self._pending.clear()
+            for event_id in ids:
+                self._remove(event_id)
+            for row in self._query().filter(Event.id.in_([UUID(i) for i in ids])):
+                self._add(row)
+
+    def lookup(self, prefix, limit=8):
+        """Return up to ``limit`` suggestions for ``prefix``.
+
+        Values that start with the prefix rank ahead of word-start matches
+        inside them; then titles come before venues and categories. Venues
+        and categories are returned once however many events share them.
+        """
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+        with self._lock:
+            self._sync()
+            start = bisect_left(self._entries, (prefix,))
+            candidates = []
+            for entry in self._entries[start:start + _MAX_CANDIDATES]:
+                if not entry[0].startswith(prefix):
+                    break
+                candidates.append(entry)
+
+        best = {}
+        for key, kind, value, event_id in candidates:
+            dedupe = (kind, event_id) if kind == "title" else (kind, value.lower())
+            rank = (key != " ".join(value.lower().split()), SUGGEST_KINDS.index(kind), len(value), value, kind, event_id)
+            if dedupe not in best or rank < best[dedupe]:
+                best[dedupe] = rank
+        ranked = sorted(best.values())
+
+        suggestions = []
+        for _, _, _, value, kind, event_id in ranked[:limit]:
+            item = {"type": kind, "value": value}
+            if kind == "title":
+                item["event_id"] = event_id
+            suggestions.append(item)
+        return suggestions
+
+
+suggest_index = SuggestIndex()
+
+
+@events_changed.connect
+def _on_events_changed(sender, event_id=None, **extra):
+    suggest_index.invalidate(event_id)
@@ -0,0 +1,145 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from uuid import UUID
+
+from ..extensions import db
+from ..models.event import Event
+from .invalidation import events_changed
+
+
+class TimelineIndex:
+    """In-process index of published events that have not ended yet.
+
+    Events are kept in one list sorted by ``(start_date, id)``, so upcoming
+    pages are a bisect plus a slice. Each event is also filed in a bucket
+    keyed by its end time rounded up to ``bucket_seconds``; as the clock
+    passes a bucket, its events are dropped, so the index rolls forward
+    without rescanning. Writes reported through ``events_changed`` are
+    patched in per event, and the whole index is reloaded every
+    ``reload_seconds`` to pick up writes made by other workers.
+    """
+
+    def __init__(self, bucket_seconds=300, reload_seconds=300):
+        self.bucket_seconds = bucket_seconds
+        self.reload_seconds = reload_seconds
+        self._entries = []  # sorted (start_date, id, end_date)
+        self._by_event = {}  # id -> entry
+        self._buckets = {}  # bucket end timestamp -> ids
+        self._bucket_heap = []
+        self._pending = set()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.bucket_seconds = app.config.get("TIMELINE_BUCKET_SECONDS", 300)
+        self.reload_seconds = app.config.get("TIMELINE_RELOAD_SECONDS", 300)
+
+    def invalidate(self, event_id=None):
+        """Queue ``event_id`` for a refresh, or the whole index when None."""
+        with self._lock:
+            if event_id is None:
+                self._loaded_at = None
+            else:
+                self._pending.add(str(event_id))
+
+    def _bucket_for(self, end_date):
+        ts = end_date.timestamp()
+        return ts - ts % self.bucket_seconds + self.bucket_seconds
+
+    def _add(self, event_id, start_date, end_date, keep_sorted=True):
+        entry = (start_date, event_id, end_date)
+        if keep_sorted:
+            insort(self._entries, entry)
+        else:
+            self._entries.append(entry)
+        self._by_event[event_id] = entry
+        bucket = self._bucket_for(end_date)
+        if bucket not in self._buckets:
+            self._buckets[bucket] = set()
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].add(event_id)
+
+    def _remove(self, event_id):
+        entry = self._by_event.pop(event_id, None)
+        if entry is None:
+            return
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+        ids = self._buckets.get(self._bucket_for(entry[2]))
+        if ids is not None:
+            ids.discard(event_id)
+
+    def _query(self, now):
+        # Served by the partial index on end_date WHERE is_published
+        return db.session.query(Event.id, Event.start_date, Event.end_date).filter(
+            Event.is_published.is_(True), Event.end_date > now
+        )
+
+    def _roll_forward(self, now):
+        ts = now.timestamp()
+        while self._bucket_heap and self._bucket_heap[0] <= ts:
+            bucket = heapq.heappop(self._bucket_heap)
+            for event_id in self._buckets.pop(bucket, ()):
+                self._remove(event_id)
+
+    def _sync(self, now):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_seconds:
+            self._entries, self._by_event = [], {}
+            self._buckets, self._bucket_heap, self._pending = {}, [], set()
+            for row in self._query(now).yield_per(1000):
+                self._add(row.id, row.start_date, row.end_date, keep_sorted=False)
+            self._entries.sort()
+            self._loaded_at = time.monotonic()
+        elif self._pending:
+            ids = [UUID(i) for i in self._pending]
+            self._pending.clear()
+            for event_id in ids:
+                self._remove(event_id)
+            for row in self._query(now).filter(Event.id.in_(ids)):
+                self._add(row.id, row.start_date, row.end_date)
+        self._roll_forward(now)
+
+    def upcoming(self, limit, after=None, now=None):
+        """Ids of published events starting after ``now``, soonest first.
+
+        Args:
+            limit: Page size. One extra id is returned when more follow.
+            after: ``(start_date, id)`` of the last event of the previous page.
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._sync(now)
+            # Events starting exactly now count as live
+            start = bisect_right(self._entries, (now, UUID(int=2 ** 128 - 1)))
+            if after is not None:
+                start = max(start, bisect_right(self._entries, (*after, datetime.max)))
+            return [entry[:2] for entry in self._entries[start:start + limit + 1]]
+
+    def live(self, limit, after=None, now=None):
+        """Ids of published events in progress at ``now``, by start date."""
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._sync(now)
+            end = bisect_right(self._entries, (now, UUID(int=2 ** 128 - 1)))
+            start = bisect_right(self._entries, (*after, datetime.max)) if after is not None else 0
+            found = []
+            # Everything left in the index ends after now (modulo the
+            # current bucket), so only the end check is needed
+            for entry in self._entries[start:end]:
+                if entry[2] > now:
+                    found.append(entry[:2])
+                    if len(found) > limit:
+                        break
+            return found
+
+
+timeline_index = TimelineIndex()
+
+
+@events_changed.connect
+def _on_events_changed(sender, event_id=None, **extra):
+    timeline_index.invalidate(event_id)
@@ -85,5 +85,71 @@ class Config:
     API_PREFIX = "/api/v1"
     SWAGGER_UI_DOC_EXPANSION = "list"
 
+    # Pagination totals: exact | cached | estimate (overridable with ?count=)
+    EVENTS_COUNT_STRATEGY = os.getenv("EVENTS_COUNT_STRATEGY", "exact")
+    COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", 60))  # seconds
+
+    # Public GET response cache (in-process LRU, or shared via Redis URL)
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))  # seconds
+    RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", 2048))
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+    # Batch lookups (?ids=a,b,c): most ids resolved per request
+    BATCH_IDS_MAX = int(os.getenv("BATCH_IDS_MAX", 200))
+    # Sub-requests accepted by one POST /api/batch
+    BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+    # Occurrences created by one POST /api/events/<id>/series
+    EVENT_SERIES_MAX = int(os.getenv("EVENT_SERIES_MAX", 104))
+
+    # JSON responses: auto (orjson when installed) | orjson | default (stdlib)
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "auto")
+
+    # Response compression (gzip, plus brotli when installed)
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500))  # bytes
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))  # 0-11
+
+    # CDN caching of public reads (Cache-Control + Surrogate-Key, purged on writes)
+    EDGE_CACHE_ENABLED = os.getenv("EDGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    EDGE_CACHE_MAX_AGE = int(os.getenv("EDGE_CACHE_MAX_AGE", 30))  # browser, seconds
+    EDGE_CACHE_S_MAXAGE = int(os.getenv("EDGE_CACHE_S_MAXAGE", 300))  # CDN, seconds
+    EDGE_CACHE_SWR = int(os.getenv("EDGE_CACHE_SWR", 60))  # stale-while-revalidate, seconds
+    # null | file:<path> | package.module:ClassName
+    EDGE_CACHE_PURGER = os.getenv("EDGE_CACHE_PURGER", "null")
+
+    # Shared ticket availability snapshot behind /api/availability
+    AVAILABILITY_TTL = int(os.getenv("AVAILABILITY_TTL", 5))  # seconds
+    AVAILABILITY_MAXSIZE = int(os.getenv("AVAILABILITY_MAXSIZE", 10000))  # events
+
+    # In-memory upcoming/live timeline: end-time bucket width and full reload
+    # interval (picks up writes made by other workers), in seconds
+    TIMELINE_BUCKET_SECONDS = int(os.getenv("TIMELINE_BUCKET_SECONDS", 300))
+    TIMELINE_RELOAD_SECONDS = int(os.getenv("TIMELINE_RELOAD_SECONDS", 300))
+
+    # Full rebuild interval of the in-memory /api/events/suggest index, so
+    # writes made by other workers show up (seconds)
+    SUGGEST_RELOAD_SECONDS = int(os.getenv("SUGGEST_RELOAD_SECONDS", 300))
+
+    # Inventory holds for unpaid (M-Pesa pending) orders and their sweeper
+    HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", 600))
+    HOLD_SWEEPER_ENABLED = os.getenv("HOLD_SWEEPER_ENABLED", "true").lower() in ("1", "true", "yes")
+    HOLD_SWEEP_INTERVAL = int(os.getenv("HOLD_SWEEP_INTERVAL", 30))  # seconds
+    HOLD_SWEEP_BATCH = int(os.getenv("HOLD_SWEEP_BATCH", 500))
+
+    # Upper bound for a ticket type's inventory_shards (sharded counters)
+    INVENTORY_SHARDS_MAX = int(os.getenv("INVENTORY_SHARDS_MAX", 64))
+
+    # Idempotency-Key support on order/payment creation: how long responses
+    # are replayed, how long a duplicate waits for the original, and how
+    # often (fraction of new keys) an expired batch is purged
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
+    # An unfinished request older than this is presumed dead (worker killed)
+    IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", 120))
+    IDEMPOTENCY_PURGE_RATE = float(os.getenv("IDEMPOTENCY_PURGE_RATE", 0.01))
+    IDEMPOTENCY_PURGE_BATCH = int(os.getenv("IDEMPOTENCY_PURGE_BATCH", 500))
+
     # Rate Limiting
     RATELIMIT_DEFAULT = "200 per day;50 per hour"
@@ -0,0 +1,44 @@
+"""Add full-text search vector to events
+
+Revision ID: b4e1c7d2a9f3
+Revises: ac3dc7e9e812
+Create Date: 2026-10-17 09:12:40.218311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1c7d2a9f3'
+down_revision = 'ac3dc7e9e812'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres only: SQLite databases get an FTS5 shadow table from
+    # app.utils.search.install_event_search at startup.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(venue_name, '')), 'B') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(address, '')), 'C') || "
+        "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'D')"
+        ") STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_search_vector "
+        "ON events USING gin (search_vector)"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_events_search_vector")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS search_vector")
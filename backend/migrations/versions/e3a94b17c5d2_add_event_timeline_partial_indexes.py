@@ -0,0 +1,30 @@
+"""Add partial indexes for the upcoming/live event timeline
+
+Revision ID: e3a94b17c5d2
+Revises: c8f2a61d0b7e
+Create Date: 2026-10-17 14:05:12.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a94b17c5d2'
+down_revision = 'c8f2a61d0b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Only published events are listed on the timeline, so the indexes
+    # leave drafts out entirely
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_upcoming_start_date', ['start_date'], unique=False, postgresql_where=sa.text('is_published'))
+        batch_op.create_index('ix_events_upcoming_end_date', ['end_date'], unique=False, postgresql_where=sa.text('is_published'))
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_upcoming_end_date')
+        batch_op.drop_index('ix_events_upcoming_start_date')
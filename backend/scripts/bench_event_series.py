@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Time creating a recurring series: one commit per object vs clone_event.
+
+The baseline mirrors what organizers do today through the API: one
+create_event commit per occurrence followed by one create_ticket_type commit
+per ticket type. The bulk path is app.services.event_series.clone_event,
+used by POST /api/events/<id>/series.
+
+Usage: python scripts/bench_event_series.py [--weeks 52] [--ticket-types 3]
+       [--repeat 3] [--database sqlite:////tmp/bench_series.db]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app package loads config, which insists on a JWT secret
+os.environ.setdefault("JWT_SECRET_KEY", "bench-only-secret")
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import event as sa_event  # noqa: E402
+
+from app.extensions import db  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.ticket import TicketType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.event_series import clone_event, series_starts  # noqa: E402
+
+
+def make_source(n_ticket_types):
+    organizer = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="x", role="organizer")
+    db.session.add(organizer)
+    db.session.flush()
+    start = datetime(2025, 1, 6, 19, 0, 0)
+    source = Event(
+        organizer_id=organizer.id, title="Weekly Jazz", description="x" * 500,
+        category="music", venue_name="Hall", start_date=start,
+        end_date=start + timedelta(hours=3), is_published=True,
+    )
+    db.session.add(source)
+    db.session.flush()
+    for i in range(n_ticket_types):
+        db.session.add(TicketType(
+            event_id=source.id, name=f"Tier {i}", price=1000 * (i + 1), quantity_total=200,
+        ))
+    db.session.commit()
+    return source
+
+
+def one_by_one(source, starts):
+    ticket_types = TicketType.query.filter_by(event_id=source.id).all()
+    duration = source.end_date - source.start_date
+    for start in starts:
+        ev = Event(
+            organizer_id=source.organizer_id, title=source.title, description=source.description,
+            category=source.category, venue_name=source.venue_name, address=source.address,
+            start_date=start, end_date=start + duration, is_published=False,
+        )
+        db.session.add(ev)
+        db.session.commit()
+        for tt in ticket_types:
+            db.session.add(TicketType(
+                event_id=ev.id, name=tt.name, price=tt.price, quantity_total=tt.quantity_total,
+            ))
+            db.session.commit()
+
+
+def bulk(source, starts):
+    clone_event(source, starts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--ticket-types", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database", default="sqlite:////tmp/bench_series.db")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        statements = [0]
+        sa_event.listen(db.engine, "before_cursor_execute", lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+        source = make_source(args.ticket_types)
+        starts = series_starts(source, f"FREQ=WEEKLY;COUNT={args.weeks + 1}", args.weeks)
+        print(f"{args.weeks} events x {args.ticket_types} ticket types on {db.engine.dialect.name}")
+        print(f"{'strategy':<12} {'best':>10} {'events/s':>10} {'statements':>11}")
+        for name, fn in (("one-by-one", one_by_one), ("bulk", bulk)):
+            best = None
+            for _ in range(args.repeat):
+                statements[0] = 0
+                began = time.perf_counter()
+                fn(source, starts)
+                elapsed = time.perf_counter() - began
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{name:<12} {best * 1000:>8.1f}ms {args.weeks / best:>10.0f} {statements[0]:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
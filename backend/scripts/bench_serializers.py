@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Compare marshmallow dumps with the compiled serializers in app.schemas.fast.
+
+Builds transient model objects (no database needed), checks that both
+paths produce byte-identical JSON, then times them.
+
+Usage: python scripts/bench_serializers.py [--orders 500] [--items 4] [--repeat 5]
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app package loads config, which insists on a JWT secret
+os.environ.setdefault("JWT_SECRET_KEY", "bench-only-secret")
+
+from app.models.event import Event  # noqa: E402
+from app.models.order import Order, OrderItem  # noqa: E402
+from app.models.ticket import TicketType  # noqa: E402
+from app.schemas import order_schema  # noqa: E402
+from app.schemas.event_schema import EventSchema  # noqa: E402
+from app.schemas.fast import compile_schema  # noqa: E402
+from app.schemas.order_schema import OrderItemSchema, OrderSchema  # noqa: E402
+from app.schemas.ticket_schema import TicketTypeSchema  # noqa: E402
+
+
+def build_orders(n_orders, n_items):
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    event = Event(
+        id=uuid.uuid4(), organizer_id=uuid.uuid4(), title="Benchmark Night",
+        description="x" * 2000, category="music", venue_name="Hall", address="Somewhere",
+        start_date=now, end_date=now + timedelta(hours=4),
+        banner_image_url="https://example.com/banner.png", is_published=True,
+        created_at=now, updated_at=now,
+    )
+    ticket_types = [
+        TicketType(
+            id=uuid.uuid4(), event_id=event.id, name=f"Tier {i}", price=1000 * (i + 1),
+            quantity_total=500, quantity_sold=10 * i, created_at=now, updated_at=now,
+        )
+        for i in range(3)
+    ]
+    orders = []
+    for i in range(n_orders):
+        order = Order(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), event_id=event.id, event=event,
+            total_amount=1000 * n_items, status="paid" if i % 4 else "pending",
+            created_at=now + timedelta(minutes=i),
+        )
+        order.items = [
+            OrderItem(
+                id=uuid.uuid4(), ticket_type_id=ticket_types[j % 3].id,
+                ticket_type=ticket_types[j % 3], quantity=1, unit_price=1000,
+                qr_code=f"QR-{i}-{j}", checked_in=bool(j % 2),
+                checked_in_at=now if j % 2 else None,
+            )
+            for j in range(n_items)
+        ]
+        orders.append(order)
+    return event, ticket_types, orders
+
+
+@contextlib.contextmanager
+def plain_marshmallow():
+    """Make OrderSchema.get_items use an uncompiled schema, for the baseline."""
+    compiled = order_schema.order_items_schema
+    order_schema.order_items_schema = compiled.schema
+    try:
+        yield
+    finally:
+        order_schema.order_items_schema = compiled
+
+
+def encode(data):
+    # Same settings as Flask's default JSON provider
+    return json.dumps(data, sort_keys=True, ensure_ascii=True).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--items", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    event, ticket_types, orders = build_orders(args.orders, args.items)
+    items = [item for order in orders for item in order.items]
+    cases = [
+        ("OrderSchema", OrderSchema(many=True), orders),
+        ("OrderItemSchema", OrderItemSchema(many=True), items),
+        ("EventSchema", EventSchema(many=True), [event] * args.orders),
+        ("TicketTypeSchema", TicketTypeSchema(many=True), ticket_types * args.orders),
+    ]
+
+    print(f"{'schema':<18} {'objects':>8} {'marshmallow':>12} {'compiled':>10} {'speedup':>8}")
+    failed = False
+    for name, schema, objs in cases:
+        compiled = compile_schema(schema)
+        with plain_marshmallow():
+            expected = schema.dump(objs)
+        actual = compiled.dump(objs)
+        if encode(expected) != encode(actual) or list(expected[0]) != list(actual[0]):
+            print(f"{name}: compiled output differs from marshmallow")
+            failed = True
+            continue
+        with plain_marshmallow():
+            slow = min(timeit.repeat(lambda: schema.dump(objs), number=1, repeat=args.repeat))
+        fast = min(timeit.repeat(lambda: compiled.dump(objs), number=1, repeat=args.repeat))
+        print(f"{name:<18} {len(objs):>8} {slow * 1000:>10.1f}ms {fast * 1000:>8.1f}ms {slow / fast:>7.1f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
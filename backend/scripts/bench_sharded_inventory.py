@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Contended purchase throughput: one ticket_types row vs sharded counters.
+
+Every worker thread buys tickets of the same ticket type through
+app.services.inventory.reserve_tickets, keeps its transaction open for
+--work-ms (standing in for inserting the order, items and tickets) and
+commits, until the stock runs out. The run is repeated with the stock on
+the ticket_types row (0 shards) and split over each --shards count, and
+each run must hand out exactly --total tickets.
+
+The single row serializes buyers for the whole of their transaction; with
+shards, buyers holding different shards proceed in parallel. Use a
+PostgreSQL URL to see it: SQLite locks the whole database for every
+writer, so there it only checks the bookkeeping.
+
+Usage: python scripts/bench_sharded_inventory.py [--threads 32] [--total 2000]
+       [--shards 4,16] [--work-ms 5]
+       [--database postgresql+psycopg2://localhost/tickets_bench]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app package loads config, which insists on a JWT secret
+os.environ.setdefault("JWT_SECRET_KEY", "bench-only-secret")
+
+from flask import Flask  # noqa: E402
+
+from app.extensions import db  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.ticket import TicketType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.inventory import (  # noqa: E402
+    InsufficientInventory,
+    fold_shard_counters,
+    reserve_tickets,
+    shard_ticket_type,
+)
+
+
+def setup(total, shards):
+    organizer = User(email=f"bench-{uuid.uuid4()}@example.com", password_hash="x", role="organizer")
+    db.session.add(organizer)
+    db.session.flush()
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        organizer_id=organizer.id, title="Early Bird rush", start_date=start,
+        end_date=start + timedelta(hours=3), is_published=True,
+    )
+    db.session.add(event)
+    db.session.flush()
+    ticket_type = TicketType(event_id=event.id, name="Early Bird", price=1000, quantity_total=total)
+    db.session.add(ticket_type)
+    db.session.flush()
+    if shards:
+        shard_ticket_type(ticket_type.id, shards)
+    db.session.commit()
+    return event.id, ticket_type.id
+
+
+def worker(app, event_id, ticket_type_id, work, results, lock):
+    sold = errors = 0
+    with app.app_context():
+        while True:
+            try:
+                reserve_tickets(event_id, {ticket_type_id: 1})
+                time.sleep(work)
+                db.session.commit()
+                sold += 1
+            except InsufficientInventory as e:
+                db.session.rollback()
+                if e.remaining == 0:
+                    break
+            except Exception:
+                db.session.rollback()
+                errors += 1
+                time.sleep(0.01)
+    with lock:
+        results["sold"] += sold
+        results["errors"] += errors
+
+
+def run(app, args, shards):
+    with app.app_context():
+        event_id, ticket_type_id = setup(args.total, shards)
+    results = {"sold": 0, "errors": 0}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(app, event_id, ticket_type_id, args.work_ms / 1000, results, lock))
+        for _ in range(args.threads)
+    ]
+    began = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    with app.app_context():
+        fold_shard_counters([ticket_type_id])
+        db.session.commit()
+        ticket_type = db.session.get(TicketType, ticket_type_id)
+        ok = results["sold"] == ticket_type.quantity_sold == args.total and ticket_type.quantity_available == 0
+    print(
+        f"{shards:>6} {elapsed:>8.2f}s {results['sold'] / elapsed:>10.0f} "
+        f"{results['errors']:>8} {'OK' if ok else 'OVERSOLD/MISMATCH':>6}"
+    )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--shards", default="4,16", help="comma-separated shard counts to compare with 0")
+    parser.add_argument("--work-ms", type=float, default=5)
+    parser.add_argument("--database", default="sqlite:////tmp/bench_sharded_inventory.db")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database
+    if args.database.startswith("sqlite"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+    else:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": args.threads, "max_overflow": 0}
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+
+    print(f"{args.threads} threads buying {args.total} tickets on {args.database.split(':', 1)[0]}, "
+          f"{args.work_ms:g}ms of work per order")
+    print(f"{'shards':>6} {'elapsed':>9} {'orders/s':>10} {'retries':>8} {'check':>6}")
+    ok = all([run(app, args, shards) for shards in [0] + [int(n) for n in args.shards.split(",") if n]])
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Hammer one ticket type from many threads and check nothing is oversold.
+
+Each worker repeatedly reserves tickets with
+app.services.inventory.reserve_tickets and commits, the same way
+create_order does, until the ticket type is sold out. At the end
+quantity_sold must equal quantity_total and the tickets handed out must add
+up to it exactly.
+
+Use a PostgreSQL URL to exercise real row locking; SQLite serializes
+writers, so it only checks the bookkeeping.
+
+Usage: python scripts/stress_inventory.py [--threads 32] [--total 500]
+       [--max-quantity 3] [--database sqlite:////tmp/stress_inventory.db]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app package loads config, which insists on a JWT secret
+os.environ.setdefault("JWT_SECRET_KEY", "stress-only-secret")
+
+from flask import Flask  # noqa: E402
+
+from app.extensions import db  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.ticket import TicketType  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.inventory import InsufficientInventory, reserve_tickets  # noqa: E402
+
+
+def setup(total):
+    organizer = User(email=f"stress-{uuid.uuid4()}@example.com", password_hash="x", role="organizer")
+    db.session.add(organizer)
+    db.session.flush()
+    start = datetime.utcnow() + timedelta(days=7)
+    event = Event(
+        organizer_id=organizer.id, title="On-sale spike", start_date=start,
+        end_date=start + timedelta(hours=3), is_published=True,
+    )
+    db.session.add(event)
+    db.session.flush()
+    ticket_type = TicketType(event_id=event.id, name="GA", price=1000, quantity_total=total)
+    db.session.add(ticket_type)
+    db.session.commit()
+    return event.id, ticket_type.id
+
+
+def worker(app, event_id, ticket_type_id, max_quantity, results, lock):
+    sold = rejected = errors = 0
+    rng = random.Random()
+    with app.app_context():
+        while True:
+            quantity = rng.randint(1, max_quantity)
+            try:
+                reserve_tickets(event_id, {ticket_type_id: quantity})
+                db.session.commit()
+                sold += quantity
+            except InsufficientInventory as e:
+                db.session.rollback()
+                rejected += 1
+                if e.remaining == 0:
+                    break
+            except Exception:
+                db.session.rollback()
+                errors += 1
+                time.sleep(0.01)
+    with lock:
+        results["sold"] += sold
+        results["rejected"] += rejected
+        results["errors"] += errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--total", type=int, default=500)
+    parser.add_argument("--max-quantity", type=int, default=3)
+    parser.add_argument("--database", default="sqlite:////tmp/stress_inventory.db")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database
+    if args.database.startswith("sqlite"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        event_id, ticket_type_id = setup(args.total)
+
+    results = {"sold": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(app, event_id, ticket_type_id, args.max_quantity, results, lock))
+        for _ in range(args.threads)
+    ]
+    began = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    with app.app_context():
+        ticket_type = db.session.get(TicketType, ticket_type_id)
+        quantity_sold = ticket_type.quantity_sold
+    print(f"{args.threads} threads on {args.database.split(':', 1)[0]}, {elapsed:.2f}s")
+    print(f"tickets handed out: {results['sold']}  quantity_sold: {quantity_sold}  total: {args.total}")
+    print(f"rejected attempts: {results['rejected']}  errors (retried): {results['errors']}")
+    ok = results["sold"] == quantity_sold == args.total
+    print("OK: no oversell" if ok else "FAIL: inventory mismatch")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
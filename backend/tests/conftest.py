@@ -0,0 +1,80 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+# Importing config insists on a JWT secret
+os.environ.setdefault("JWT_SECRET_KEY", "test-only-secret-key-0123456789abcdef")
+
+from config import Config  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.invalidation import notify_events_changed  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """A fresh app and schema per test.
+
+    Runs on ``TEST_DATABASE_URL`` when set (a scratch PostgreSQL database;
+    its tables are dropped afterwards), otherwise on a throwaway SQLite file.
+    """
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'test.db'}"
+    options = {"connect_args": {"timeout": 30}} if url.startswith("sqlite") else {}
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", url)
+    monkeypatch.setattr(Config, "SQLALCHEMY_ENGINE_OPTIONS", options)
+    monkeypatch.setattr(Config, "RATELIMIT_ENABLED", False, raising=False)
+    monkeypatch.setattr(Config, "HOLD_SWEEPER_ENABLED", False)
+    app = create_app()
+    app.config["TESTING"] = True
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _create_organizer():
+    organizer = User(email=f"organizer-{uuid.uuid4()}@example.com", password_hash="x", role="organizer")
+    db.session.add(organizer)
+    db.session.flush()
+    return organizer.id
+
+
+@pytest.fixture
+def organizer(app):
+    """An organizer's id and the Authorization headers to act as them."""
+    with app.app_context():
+        organizer_id = _create_organizer()
+        db.session.commit()
+        token = create_access_token(identity=str(organizer_id), additional_claims={"role": "organizer"})
+    return SimpleNamespace(id=organizer_id, headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.fixture
+def make_event(app):
+    """Create a published event and return its id. Without an
+    ``organizer_id`` a new organizer is created for it."""
+    def make(organizer_id=None, **fields):
+        with app.app_context():
+            start = fields.pop("start_date", datetime.utcnow() + timedelta(days=7))
+            event = Event(
+                organizer_id=organizer_id or _create_organizer(), title=fields.pop("title", "Jazz Night"),
+                start_date=start, end_date=start + timedelta(hours=3),
+                is_published=True, **fields,
+            )
+            db.session.add(event)
+            db.session.commit()
+            notify_events_changed(event.id)
+            return event.id
+    return make
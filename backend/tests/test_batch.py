@@ -0,0 +1,24 @@
+import flask_jwt_extended.view_decorators
+
+
+def test_batch_verifies_the_token_once(client, organizer, make_event, monkeypatch):
+    make_event(organizer_id=organizer.id)
+    decoded = []
+    decode_token = flask_jwt_extended.view_decorators.decode_token
+    monkeypatch.setattr(
+        flask_jwt_extended.view_decorators, "decode_token",
+        lambda *args, **kwargs: decoded.append(args) or decode_token(*args, **kwargs),
+    )
+
+    paths = ["/api/dashboard/organizer", "/api/events?mine=true", "/api/orders/user"]
+    response = client.post("/api/batch", json={"requests": paths}, headers=organizer.headers)
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json["responses"]] == [200, 200, 200]
+    assert response.json["responses"][1]["body"]["meta"]["total"] == 1
+    assert len(decoded) == 1
+
+
+def test_batch_without_token_keeps_sub_requests_protected(client):
+    response = client.post("/api/batch", json={"requests": ["/api/dashboard/organizer", "/api/events"]})
+    assert [r["status"] for r in response.json["responses"]] == [401, 200]
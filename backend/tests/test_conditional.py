@@ -0,0 +1,31 @@
+from app.utils.conditional import make_etag
+
+
+def test_etag_covers_empty_args(app):
+    with app.test_request_context("/api/events"):
+        plain = make_etag("events")
+    with app.test_request_context("/api/events?cursor="):
+        keyset = make_etag("events")
+    assert plain != keyset
+
+
+def test_listing_etag_changes_with_content(client, make_event):
+    make_event()
+    etag = client.get("/api/events").headers["ETag"]
+
+    assert client.get("/api/events", headers={"If-None-Match": etag}).status_code == 304
+
+    make_event(title="Tech Conference")
+    assert client.get("/api/events", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_empty_cursor_has_its_own_etag(client, make_event):
+    make_event()
+    offset = client.get("/api/events")
+    keyset = client.get("/api/events?cursor=")
+    assert offset.headers["ETag"] != keyset.headers["ETag"]
+
+    # A copy of the offset listing must not validate the keyset page
+    revalidated = client.get("/api/events?cursor=", headers={"If-None-Match": offset.headers["ETag"]})
+    assert revalidated.status_code == 200
+    assert "next_cursor" in revalidated.json["meta"]
@@ -0,0 +1,29 @@
+from app.extensions import db
+from app.models.order import Order
+from app.models.ticket import TicketType
+from app.services.inventory import hold_tickets, release_holds, shard_ticket_type
+from app.utils.invalidation import notify_ticket_types_changed
+
+
+def test_available_filter_reads_shards_between_rollups(app, client, organizer, make_event):
+    event_id = make_event(organizer_id=organizer.id)
+    with app.app_context():
+        ticket_type = TicketType(event_id=event_id, name="GA", price=1000, quantity_total=4)
+        db.session.add(ticket_type)
+        db.session.flush()
+        shard_ticket_type(ticket_type.id, 2)
+        order = Order(user_id=organizer.id, event_id=event_id, status="pending")
+        db.session.add(order)
+        db.session.flush()
+        # Selling out rolls the shards up; releasing the hold does not
+        hold_tickets(event_id, {ticket_type.id: 4}, order.id, 600)
+        db.session.commit()
+        release_holds(order.id)
+        db.session.commit()
+        notify_ticket_types_changed(event_id)
+
+    listing = client.get("/api/events?available=true").json
+    assert [item["id"] for item in listing["items"]] == [str(event_id)]
+    assert client.get("/api/events?available=false").json["items"] == []
+    tickets = client.get(f"/api/events/{event_id}/tickets").json
+    assert [t["quantity_available"] for t in tickets] == [4]
@@ -0,0 +1,73 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+pytest.importorskip("orjson")
+
+from app.utils.json_provider import OrjsonProvider  # noqa: E402
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+EVENT = {
+    "id": "0b5d3c8e-6a59-4f5e-9a43-2f1f0f4b9b1e",
+    "organizer_id": "5f0c1d2e-3b4a-4c5d-8e6f-7a8b9c0d1e2f",
+    "title": "Jazz Night",
+    "description": "Line one\nLine \"two\"\t<b>bold</b> & more",
+    "category": "music",
+    "venue_name": None,
+    "start_date": "2025-01-01T19:00:00",
+    "is_published": True,
+    "created_at": "2025-01-01T10:00:00.123456",
+}
+
+# Payloads shaped like API responses, plus the cases the provider falls back on
+GOLDEN = {
+    "event": {"event": EVENT},
+    "event list": {"items": [EVENT] * 3, "meta": {"page": 1, "per_page": 10, "total": 3, "pages": 1, "count": "exact"}},
+    "empty list": {"items": [], "meta": {"next_cursor": None, "prev_cursor": None, "per_page": 10}},
+    "order": {"order": {"id": str(uuid.UUID(int=1)), "total_amount": 250000, "status": "paid", "items": [{"quantity": 2, "qr_code": None}]}},
+    "top-level list": [{"name": "GA", "price": 1000, "quantity_available": 0}],
+    "message": {"message": "Event not found"},
+    "raw uuid": {"id": uuid.UUID(int=2)},
+    "raw datetime": {"at": datetime(2025, 1, 2, 3, 4, 5), "on": date(2025, 1, 2)},
+    "decimal": {"amount": Decimal("12.50")},
+    "dataclass": {"point": Point(1, 2)},
+    "non-ascii": {"title": "Café – Nairobi 🎷"},
+    "non-string keys": {1: "one", 2: "two"},
+    "big int": {"n": 2 ** 70},
+    "floats": {"ratio": 0.25, "avg": 1234.5},
+    "none": None,
+}
+
+
+def _render(provider_cls, payload, debug=False, sort_keys=True):
+    app = Flask(__name__)
+    app.debug = debug
+    app.json = provider_cls(app)
+    app.json.sort_keys = sort_keys
+    with app.app_context():
+        return app.json.response(payload).get_data()
+
+
+@pytest.mark.parametrize("debug", [False, True], ids=["compact", "indented"])
+@pytest.mark.parametrize("name", list(GOLDEN))
+def test_orjson_output_matches_default_provider(name, debug):
+    payload = GOLDEN[name]
+    assert _render(OrjsonProvider, payload, debug) == _render(DefaultJSONProvider, payload, debug)
+
+
+def test_unsorted_keys_keep_insertion_order():
+    payload = {"zeta": 1, "alpha": {"b": 2, "a": 1}}
+    expected = _render(DefaultJSONProvider, payload, sort_keys=False)
+    assert _render(OrjsonProvider, payload, sort_keys=False) == expected
+    assert expected.index(b"zeta") < expected.index(b"alpha")
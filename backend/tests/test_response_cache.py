@@ -0,0 +1,16 @@
+def test_empty_cursor_is_cached_apart_from_offset_listing(client, make_event):
+    for title in ("Jazz Night", "Tech Conference", "Food Fair"):
+        make_event(title=title)
+
+    offset = client.get("/api/events?per_page=2")
+    assert offset.headers["X-Cache"] == "MISS"
+    assert "total" in offset.json["meta"]
+
+    # ?cursor= is the keyset first page, not a repeat of the offset listing
+    keyset = client.get("/api/events?per_page=2&cursor=")
+    assert keyset.headers["X-Cache"] == "MISS"
+    assert "total" not in keyset.json["meta"]
+    assert keyset.json["meta"]["next_cursor"]
+
+    assert client.get("/api/events?per_page=2").headers["X-Cache"] == "HIT"
+    assert client.get("/api/events?per_page=2&cursor=").json == keyset.json
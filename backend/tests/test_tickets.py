@@ -0,0 +1,46 @@
+import pytest
+
+from app.extensions import db
+from app.models.ticket import TicketType
+from app.services.inventory import reserve_tickets, shard_ticket_type
+
+
+@pytest.fixture
+def sold_ticket_type(app, organizer, make_event):
+    """A ticket type of 10 with 6 sold, optionally sharded."""
+    def make(shards=0):
+        event_id = make_event(organizer_id=organizer.id)
+        with app.app_context():
+            ticket_type = TicketType(event_id=event_id, name="GA", price=1000, quantity_total=10)
+            db.session.add(ticket_type)
+            db.session.flush()
+            if shards:
+                shard_ticket_type(ticket_type.id, shards)
+            reserve_tickets(event_id, {ticket_type.id: 6})
+            db.session.commit()
+            return f"/api/events/{event_id}/tickets/{ticket_type.id}", ticket_type.id
+    return make
+
+
+@pytest.mark.parametrize("shards", [0, 4])
+def test_quantity_total_cannot_drop_below_sold(app, client, organizer, sold_ticket_type, shards):
+    url, ticket_type_id = sold_ticket_type(shards)
+
+    response = client.put(url, json={"quantity_total": 5}, headers=organizer.headers)
+    assert response.status_code == 400
+    assert "quantity_total" in response.json["errors"]
+    with app.app_context():
+        assert db.session.get(TicketType, ticket_type_id).quantity_total == 10
+
+    response = client.put(url, json={"quantity_total": 6}, headers=organizer.headers)
+    assert response.status_code == 200
+    assert response.json["quantity_total"] == 6
+    assert response.json["quantity_available"] == 0
+
+
+def test_string_shard_count_is_loaded_as_int(client, organizer, sold_ticket_type):
+    url, _ = sold_ticket_type()
+    response = client.put(url, json={"inventory_shards": "4"}, headers=organizer.headers)
+    assert response.status_code == 200
+    assert response.json["inventory_shards"] == 4
+    assert response.json["quantity_available"] == 4
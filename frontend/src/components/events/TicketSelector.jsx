@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { getEventTickets } from '../../services/tickets'
 
-export default function TicketSelector ({ eventId, onChange }) {
+export default function TicketSelector ({ eventId, initialTickets, onChange }) {
   const [tickets, setTickets] = useState([])
   const [quantities, setQuantities] = useState({})
   const [loading, setLoading] = useState(true)
@@ -10,7 +10,11 @@ export default function TicketSelector ({ eventId, onChange }) {
   useEffect(() => {
     let mounted = true
     setLoading(true)
-    getEventTickets(eventId)
+    // Use ticket types embedded in the event payload when we have them
+    const load = Array.isArray(initialTickets)
+      ? Promise.resolve({ tickets: initialTickets })
+      : getEventTickets(eventId)
+    load
       .then((res) => {
         if (!mounted) return
         // The response is already formatted as { tickets: [...] } by the service
@@ -32,7 +36,7 @@ export default function TicketSelector ({ eventId, onChange }) {
       })
       .finally(() => mounted && setLoading(false))
     return () => { mounted = false }
-  }, [eventId])
+  }, [eventId, initialTickets])
 
   useEffect(() => {
     const items = Object.entries(quantities)
@@ -24,7 +24,8 @@ export default function EventDetails () {
   useEffect(() => {
     let mounted = true
     setLoading(true)
-    fetchEvent(id)
+    // Ticket types and organizer come embedded, saving a second request
+    fetchEvent(id, { include: ['ticket_types', 'organizer'] })
       .then((res) => {
         if (!mounted) return
         setEvent(res.event)
@@ -115,7 +116,7 @@ export default function EventDetails () {
 
             <div className='border-t pt-6'>
               <h2 className='text-xl font-semibold mb-4'>Get Your Tickets</h2>
-              <TicketSelector eventId={event.id} onChange={(items, tickets) => { setCartItems(items); setTicketTypes(tickets || []) }} />
+              <TicketSelector eventId={event.id} initialTickets={event.ticket_types} onChange={(items, tickets) => { setCartItems(items); setTicketTypes(tickets || []) }} />
               
               {cartItems.length > 0 && (
                 <div className='mt-6 space-y-4'>
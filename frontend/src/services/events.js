@@ -10,8 +10,10 @@ export const fetchEvents = async ({ q = '', page = 1, perPage = 10, mine = false
   return res.data
 }
 
-export const fetchEvent = async (id) => {
-  const res = await api.get(`/events/${id}`)
+export const fetchEvent = async (id, { include } = {}) => {
+  const params = {}
+  if (include) params.include = Array.isArray(include) ? include.join(',') : include
+  const res = await api.get(`/events/${id}`, { params })
   return res.data
 }
 